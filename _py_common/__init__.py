@@ -0,0 +1,3 @@
+"""
+Helpers shared by the InvenTree scripts in this repository.
+"""
@@ -0,0 +1,84 @@
+"""
+Local state of the incremental naming audit.
+
+The state of a rule is kept in one JSON file per rule and server in the _cache
+folder at the root of the repository:
+
+    {"fingerprint": "...", "parts": {"812": {"hash": "...", "diagnostics": [...]}}}
+
+Each audited part is stored with a hash of its name and the diagnostics of its
+last check. The fingerprint covers the rule definition and the versions of the
+selection lists it refers to. A run only re-validates new parts and parts whose
+name hash changed; when the fingerprint changes (the rule was edited or one of
+its selection lists was updated) every part is checked again.
+
+The InvenTree part list has no modification-time filter, so the part names are
+still listed on every run and the changes are found by comparing the hashes.
+"""
+import hashlib
+import json
+import os
+
+from _py_common.selection_cache import CACHE_DIR
+
+def hash_name(part_name):
+    return hashlib.sha1(part_name.encode()).hexdigest()[:16]
+
+def get_rule_fingerprint(rule, selection_cache):
+    """
+    Returns a hash of the rule definition and of the versions of its selection lists.
+    """
+    segments = [segment for _, segment, _, _ in rule.segments]
+    versions = {
+        segment['selection_list']: selection_cache.get_version(segment['selection_list'])
+        for segment in segments if 'selection_list' in segment
+    }
+    definition = [rule.prefix, rule.allow_extra_segments, segments, sorted(versions.items())]
+    return hashlib.sha1(json.dumps(definition, sort_keys=True).encode()).hexdigest()[:16]
+
+class AuditState:
+    """
+    Name hashes and diagnostics of the parts audited with one rule.
+    """
+    def __init__(self, rule_name, base_url, state_dir=CACHE_DIR):
+        server_key = hashlib.sha1(base_url.encode()).hexdigest()[:12]
+        self.path = os.path.join(state_dir, f"naming_audit_{rule_name}_{server_key}.json")
+        self.data = {'fingerprint': None, 'parts': {}}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, mode='r') as file:
+                    self.data = json.load(file)
+            except ValueError:
+                pass
+
+    def select_changed(self, parts, fingerprint):
+        """
+        Returns the parts that need to be validated again. All parts are
+        returned when the fingerprint differs from the one of the last run.
+        """
+        if fingerprint != self.data['fingerprint']:
+            self.data = {'fingerprint': fingerprint, 'parts': {}}
+            return list(parts)
+        known = self.data['parts']
+        return [
+            part for part in parts
+            if str(part.pk) not in known or known[str(part.pk)]['hash'] != hash_name(part.name)
+        ]
+
+    def record(self, part_pk, part_name, diagnostics):
+        self.data['parts'][str(part_pk)] = {'hash': hash_name(part_name), 'diagnostics': diagnostics}
+
+    def prune(self, part_pks):
+        """
+        Drops the parts that are no longer in the category.
+        """
+        keep = {str(part_pk) for part_pk in part_pks}
+        self.data['parts'] = {pk: entry for pk, entry in self.data['parts'].items() if pk in keep}
+
+    def get_failing_pks(self):
+        return {int(pk) for pk, entry in self.data['parts'].items() if entry['diagnostics']}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, mode='w') as file:
+            json.dump(self.data, file)
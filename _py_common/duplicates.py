@@ -0,0 +1,40 @@
+"""
+Hash-indexed duplicate part detection.
+
+Every part name is reduced to a normalised key: the name is split into its '_'
+segments, value segments are replaced by their canonical SI value (so 10kOhm,
+10000ROhm and 10k0Ohm collide) and all other segments are stripped and
+case-folded (so SMD and smd collide). Parts are grouped by key in a dict, which
+takes one pass over all parts instead of comparing every pair, and every key
+with more than one part is a cluster of likely duplicates. The categories are
+not part of the key, so duplicates are found across categories.
+"""
+from _py_common.si_values import parse_si_value
+
+def normalize_segment(segment):
+    segment = segment.strip()
+    value = parse_si_value(segment)
+    if value is not None:
+        return value
+    return segment.casefold()
+
+def get_duplicate_key(part_name):
+    return tuple(normalize_segment(segment) for segment in part_name.split('_'))
+
+def find_duplicate_clusters(category_parts):
+    """
+    category_parts maps a category pk to its (pk, name) pairs.
+    Returns the clusters as lists of (category pk, pk, name), largest first.
+    """
+    index = {}
+    seen = set()
+    for category_pk, parts in category_parts.items():
+        for pk, part_name in parts:
+            # A part listed under two audited categories (e.g. a parent category) is not its own duplicate
+            if pk in seen:
+                continue
+            seen.add(pk)
+            index.setdefault(get_duplicate_key(part_name), []).append((category_pk, pk, part_name))
+    clusters = [members for members in index.values() if len(members) > 1]
+    clusters.sort(key=len, reverse=True)
+    return clusters
@@ -0,0 +1,210 @@
+"""
+asyncio client for the raw InvenTree REST endpoints used by the scripts.
+
+The client wraps one aiohttp session and bounds the number of requests in flight
+with a semaphore, so many listing pages or writes can be awaited together with
+asyncio.gather without flooding the server.
+
+    async with AsyncInvenTreeClient(url, token) as client:
+        parts, templates = await asyncio.gather(
+            client.list_parts(category_pk),
+            client.list_category_templates(category_pk),
+        )
+
+The number of requests in flight can be set in the .env file with
+INVENTREE_MAX_IN_FLIGHT (default 8). Timeouts and retries follow the settings of
+the sync session (HTTP_TIMEOUT, HTTP_RETRIES, HTTP_BACKOFF): idempotent requests
+are retried on connection errors, timeouts and 429/5xx answers with exponential
+backoff and jitter, honouring Retry-After.
+"""
+import asyncio
+import os
+import random
+from collections import deque
+
+import aiohttp
+
+from _py_common.inventree_session import IDEMPOTENT_METHODS, RETRY_STATUS_CODES, get_http_settings
+
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_PAGE_SIZE = 500
+
+class AsyncInvenTreeError(Exception):
+    """
+    Raised when a request fails or the server answers with an unexpected status code.
+    """
+    def __init__(self, method, endpoint, status, text):
+        super().__init__(f"{method} {endpoint} failed: {status} - {text}")
+        self.status = status
+        self.text = text
+
+class AsyncInvenTreeClient:
+    """
+    Minimal async InvenTree client. `base_url` is the API root (BASE_URL).
+    """
+    def __init__(self, base_url, token, max_in_flight=None, page_size=DEFAULT_PAGE_SIZE):
+        self.base_url = base_url if base_url.endswith('/') else f"{base_url}/"
+        self.headers = {
+            'Authorization': f'Token {token}',
+            'Content-Type': 'application/json'
+        }
+        self.max_in_flight = max_in_flight or int(os.getenv('INVENTREE_MAX_IN_FLIGHT', DEFAULT_MAX_IN_FLIGHT))
+        self.page_size = page_size
+        self.timeout, self.retries, self.backoff = get_http_settings()
+        self.request_count = 0
+        self.session = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        self.session = aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout)
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+
+    def get_retry_delay(self, attempt, retry_after=None):
+        """
+        Exponential backoff with jitter, at least the server's Retry-After.
+        """
+        delay = self.backoff * 2 ** attempt + random.uniform(0, self.backoff)
+        try:
+            return max(delay, float(retry_after)) if retry_after else delay
+        except ValueError:
+            return delay
+
+    async def request(self, method, path, params=None, json=None, expected=(200,)):
+        """
+        Sends one request and returns the decoded JSON body.
+        """
+        # 'next' links of paginated responses are absolute URLs
+        endpoint = path if path.startswith(('http://', 'https://')) else f"{self.base_url}{path}"
+        attempts = self.retries + 1 if method in IDEMPOTENT_METHODS else 1
+        for attempt in range(attempts):
+            retry_after = None
+            async with self.semaphore:
+                self.request_count += 1
+                try:
+                    async with self.session.request(method, endpoint, params=params, json=json) as response:
+                        if response.status in expected:
+                            return await response.json()
+                        error = AsyncInvenTreeError(method, endpoint, response.status, await response.text())
+                        if response.status not in RETRY_STATUS_CODES:
+                            raise error
+                        retry_after = response.headers.get('Retry-After')
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = AsyncInvenTreeError(method, endpoint, None, str(e) or type(e).__name__)
+                    error.__cause__ = e
+            # Wait outside the semaphore, so other requests can proceed meanwhile
+            if attempt + 1 < attempts:
+                await asyncio.sleep(self.get_retry_delay(attempt, retry_after))
+        raise error
+
+    async def iter_pages(self, path, params=None, prefetch=None):
+        """
+        Yields the results of a list endpoint page by page, in order. While a page
+        is being consumed, up to `prefetch` following pages are already in flight,
+        so memory stays bounded and the first rows are available right away.
+
+        The offsets are spaced by the number of rows the server actually returned
+        on the first page, since it may cap the page size below `page_size`. If a
+        page that is not the last one still comes back shorter, the prefetched
+        pages are dropped and the listing continues by following the 'next' links.
+        All pages are requested ordered by pk, so the offset pages are consistent.
+        """
+        params = {**(params or {}), 'ordering': 'pk'}
+        first_page = await self.request('GET', path, params={**params, 'limit': self.page_size, 'offset': 0})
+        # The server returns a plain list when it does not paginate the endpoint
+        if isinstance(first_page, list):
+            yield first_page
+            return
+        stride = len(first_page['results'])
+        if not stride or not first_page.get('next'):
+            yield first_page['results']
+            return
+        offsets = deque(range(stride, first_page['count'], stride))
+        prefetch = prefetch or self.max_in_flight
+        pending = deque()
+
+        def schedule():
+            while offsets and len(pending) < prefetch:
+                page_params = {**params, 'limit': stride, 'offset': offsets.popleft()}
+                pending.append(asyncio.ensure_future(self.request('GET', path, params=page_params)))
+
+        def cancel_pending():
+            offsets.clear()
+            while pending:
+                pending.popleft().cancel()
+
+        try:
+            schedule()
+            yield first_page['results']
+            while pending:
+                page = await pending.popleft()
+                if len(page['results']) < stride and page.get('next'):
+                    # Shorter page before the end: the precomputed offsets would skip rows
+                    cancel_pending()
+                    yield page['results']
+                    next_url = page['next']
+                    while next_url:
+                        page = await self.request('GET', next_url)
+                        yield page['results']
+                        next_url = page.get('next')
+                    return
+                schedule()
+                yield page['results']
+        finally:
+            cancel_pending()
+
+    async def list_all(self, path, params=None):
+        """
+        Returns all results of a list endpoint, fetching the pages concurrently.
+        """
+        results = []
+        async for page in self.iter_pages(path, params):
+            results.extend(page)
+        return results
+
+    def iter_parts(self, category_pk, with_parameters=False):
+        """
+        Yields the parts of a category page by page.
+        """
+        params = {'category': category_pk}
+        if with_parameters:
+            params['parameters'] = 'true'
+        return self.iter_pages('part/', params)
+
+    async def list_parts(self, category_pk, with_parameters=False):
+        params = {'category': category_pk}
+        if with_parameters:
+            params['parameters'] = 'true'
+        return await self.list_all('part/', params)
+
+    async def list_category_templates(self, category_pk):
+        return await self.request('GET', 'part/category/parameters/', params={'category': category_pk})
+
+    async def list_parameters(self, part_pk=None, template_pk=None):
+        params = {}
+        if part_pk is not None:
+            params['part'] = part_pk
+        if template_pk is not None:
+            params['template'] = template_pk
+        return await self.list_all('part/parameter/', params)
+
+    async def create_parameter(self, part_pk, template_pk, data):
+        payload = {'part': part_pk, 'template': template_pk, 'data': data}
+        return await self.request('POST', 'part/parameter/', json=payload, expected=(201,))
+
+    async def update_parameter(self, parameter_pk, payload):
+        return await self.request('PUT', f'part/parameter/{parameter_pk}/', json=payload)
+
+    async def list_selection_lists(self):
+        return await self.request('GET', 'selection/')
+
+    async def get_selection_list(self, selection_list_pk):
+        return await self.request('GET', f'selection/{selection_list_pk}/')
+
+    async def put_selection_list(self, selection_list_pk, payload):
+        return await self.request('PUT', f'selection/{selection_list_pk}/', json=payload)
@@ -0,0 +1,92 @@
+"""
+Shared requests session for the raw InvenTree REST calls.
+
+The session keeps pooled keep-alive connections, applies a default timeout to
+every request and retries idempotent calls (GET, HEAD, OPTIONS, PUT, DELETE) on
+connection errors and on 429/5xx answers. Retries use exponential backoff with
+jitter (urllib3 2.x; plain exponential backoff on urllib3 1.26, which has no
+jitter option) and honour the Retry-After header the server sends with a 429.
+
+The defaults can be set in the .env file:
+    HTTP_TIMEOUT    - seconds before a request times out (default 30)
+    HTTP_RETRIES    - retries per request (default 5)
+    HTTP_BACKOFF    - backoff factor in seconds (default 0.5)
+    HTTP_POOL_SIZE  - pooled connections per host (default 16)
+"""
+import inspect
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRIES = 5
+DEFAULT_BACKOFF = 0.5
+DEFAULT_POOL_SIZE = 16
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# backoff_jitter was added to Retry in urllib3 2.0
+RETRY_SUPPORTS_JITTER = 'backoff_jitter' in inspect.signature(Retry.__init__).parameters
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that applies a default timeout when the caller does not set one.
+    """
+    def __init__(self, *args, timeout=DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+def get_http_settings():
+    """
+    Returns the (timeout, retries, backoff) configured in the environment.
+    Shared with the async client, so both clients behave the same.
+    """
+    timeout = float(os.getenv('HTTP_TIMEOUT', DEFAULT_TIMEOUT))
+    retries = int(os.getenv('HTTP_RETRIES', DEFAULT_RETRIES))
+    backoff = float(os.getenv('HTTP_BACKOFF', DEFAULT_BACKOFF))
+    return timeout, retries, backoff
+
+def create_session(token=None):
+    """
+    Returns a requests session with pooling, timeouts and retry/backoff configured.
+    If a token is given, the InvenTree authentication headers are set on the session.
+    """
+    timeout, retries, backoff = get_http_settings()
+    jitter = {'backoff_jitter': backoff} if RETRY_SUPPORTS_JITTER else {}
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        **jitter,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=IDEMPOTENT_METHODS,
+        respect_retry_after_header=True,
+        # Hand the last response back to the caller instead of raising
+        raise_on_status=False
+    )
+    pool_size = int(os.getenv('HTTP_POOL_SIZE', DEFAULT_POOL_SIZE))
+    adapter = TimeoutHTTPAdapter(
+        timeout=timeout,
+        max_retries=retry,
+        pool_connections=pool_size,
+        pool_maxsize=pool_size
+    )
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if token:
+        session.headers.update({
+            'Authorization': f'Token {token}',
+            'Content-Type': 'application/json'
+        })
+    return session
@@ -0,0 +1,80 @@
+"""
+Vectorised batch audit of part names against a compiled naming rule.
+
+All names of a category are validated at once with pandas string operations
+(str.split, str.fullmatch, isin) instead of one Python call per part. The
+result is a per-segment failure matrix with one row per part:
+
+    pk, name, prefix, segment_count, <segment>..., failures
+
+where every check column is True when the part fails that check, and failures
+is the number of failed checks. The matrix is written as CSV, or as Parquet when
+the report path ends in .parquet (requires pyarrow). The report format of the
+checkers can be set in the .env file with AUDIT_REPORT_FORMAT (csv or parquet).
+
+audit_category is the picklable unit of work of the multi-category audit
+(_py_naming_audit), run once per category in a worker process.
+"""
+import os
+import time
+
+import pandas as pd
+
+def audit_part_names(parts_df, rule):
+    """
+    Validates the 'name' column of parts_df against the rule.
+    Returns the failure matrix as a DataFrame.
+    """
+    names = parts_df['name'].fillna('').astype(str)
+    expected_count = len(rule.segments) + 1
+    # Any extra segments end up together in the column after the last segment
+    split = names.str.split('_', n=expected_count, expand=True)
+    segment_counts = names.str.count('_') + 1
+
+    matrix = pd.DataFrame({'pk': parts_df['pk'], 'name': names})
+    matrix['prefix'] = split[0] != rule.prefix
+    if rule.allow_extra_segments:
+        matrix['segment_count'] = segment_counts < expected_count
+    else:
+        matrix['segment_count'] = segment_counts != expected_count
+
+    for index, (_, segment, pattern, allowed_values) in enumerate(rule.segments, start=1):
+        if index in split.columns:
+            column = split[index]
+        else:
+            column = pd.Series(None, index=names.index, dtype=object)
+        if pattern is not None:
+            passed = column.str.fullmatch(pattern.pattern)
+        else:
+            passed = column.isin(allowed_values)
+        matrix[segment['name']] = ~passed.fillna(False).astype(bool)
+
+    check_columns = ['prefix', 'segment_count'] + [segment['name'] for _, segment, _, _ in rule.segments]
+    matrix['failures'] = matrix[check_columns].sum(axis=1)
+    return matrix
+
+def audit_category(rule, parts):
+    """
+    Audits the names of one category. parts is a list of (pk, name) tuples.
+    Returns the failure matrix and the time spent auditing in seconds.
+    """
+    start = time.perf_counter()
+    parts_df = pd.DataFrame(parts, columns=['pk', 'name'])
+    matrix = audit_part_names(parts_df, rule)
+    return matrix, time.perf_counter() - start
+
+def write_audit_report(matrix, report_path):
+    """
+    Writes the failure matrix as Parquet or CSV, depending on the extension.
+    """
+    if report_path.endswith('.parquet'):
+        matrix.to_parquet(report_path, index=False)
+    else:
+        matrix.to_csv(report_path, index=False)
+
+def get_audit_report_path(csv_file_path):
+    """
+    Returns the failure matrix path that goes with an export CSV.
+    """
+    report_format = os.getenv('AUDIT_REPORT_FORMAT', 'csv')
+    return f"{os.path.splitext(csv_file_path)[0]}_audit.{report_format}"
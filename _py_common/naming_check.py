@@ -0,0 +1,137 @@
+"""
+Naming check shared by the _py_naming_check_* scripts.
+
+Each script only sets up the API and calls main with its rule name and CSV
+path. The category to check is the "category" of the rule in naming_rules.json.
+The execution modes are:
+
+    1  export all parts of the category
+    2  export the parts whose name does not follow the naming rule
+    3  batch audit with the per-segment failure matrix (see naming_audit.py)
+    4  incremental check of the parts changed since the last run (see audit_state.py)
+
+The exported CSV is the input of the matching _py_*_name_update.py script.
+"""
+import csv
+import logging
+
+import pandas as pd
+from inventree.part import Part
+
+from _py_common.audit_state import AuditState, get_rule_fingerprint
+from _py_common.inventree_session import create_session
+from _py_common.naming_audit import audit_part_names, get_audit_report_path, write_audit_report
+from _py_common.naming_rules import load_naming_rules, load_rule
+from _py_common.selection_cache import SelectionListCache
+
+def check_file_accessibility(file_path):
+    """
+    Checks if the file is accessible for writing.
+    """
+    try:
+        with open(file_path, 'w') as file:
+            pass
+    except PermissionError:
+        logging.error(f"Permission denied: {file_path}. Please close the file if it is open and try again.")
+        return False
+    return True
+
+def get_parts_in_category(api, category_pk):
+    """
+    Retrieves all parts in the specified category.
+    """
+    logging.info(f"Retrieving parts in category {category_pk}")
+    parts = Part.list(api, category=category_pk)
+    logging.info(f"Retrieved {len(parts)} parts")
+    return parts
+
+def export_parts_to_csv(parts, file_path, new_name_column=True):
+    """
+    Exports the parts to a CSV file with columns: pk, name, description and,
+    unless the update script reads the new name from the name column, new_name.
+    """
+    header = ['pk', 'name', 'description', 'new_name'] if new_name_column else ['pk', 'name', 'description']
+    with open(file_path, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        for part in parts:
+            writer.writerow([part.pk, part.name, part.description])
+    logging.info(f"Parts exported to {file_path}")
+
+def get_naming_diagnostics(part_name, rule):
+    """
+    Returns the diagnostics of the name against the compiled naming rule and
+    logs them for non-compliant names.
+    """
+    diagnostics = rule.validate(part_name)
+    if diagnostics:
+        logging.info(f"'{part_name}' is not compliant: {'; '.join(diagnostics)}")
+    return diagnostics
+
+def check_naming_convention(part_name, rule):
+    """
+    Checks if the part name follows the compiled naming rule.
+    """
+    return not get_naming_diagnostics(part_name, rule)
+
+def export_non_compliant_parts(parts, rule, selection_cache, csv_file_path, new_name_column):
+    parts_to_export = [part for part in parts if not check_naming_convention(part.name, rule)]
+    export_parts_to_csv(parts_to_export, csv_file_path, new_name_column)
+    saved_requests = len(parts) * len(rule.set_segments) - selection_cache.request_count
+    logging.info(f"Checked {len(parts)} part names with {selection_cache.request_count} selection list requests ({saved_requests} requests saved)")
+
+def audit_parts(parts, rule, csv_file_path, new_name_column):
+    """
+    Writes the failure matrix of the parts and exports the non-compliant ones.
+    """
+    parts_df = pd.DataFrame({'pk': [part.pk for part in parts], 'name': [part.name for part in parts]})
+    matrix = audit_part_names(parts_df, rule)
+    report_path = get_audit_report_path(csv_file_path)
+    write_audit_report(matrix, report_path)
+    failing_pks = set(matrix.loc[matrix['failures'] > 0, 'pk'])
+    export_parts_to_csv([part for part in parts if part.pk in failing_pks], csv_file_path, new_name_column)
+    logging.info(f"Audited {len(parts)} part names: {len(failing_pks)} not compliant, failure matrix written to {report_path}")
+
+def check_changed_parts(parts, rule, selection_cache, rule_name, base_url, csv_file_path, new_name_column):
+    """
+    Re-validates only the parts changed since the last run and exports all
+    parts that are non-compliant according to the stored state.
+    """
+    state = AuditState(rule_name, base_url)
+    changed_parts = state.select_changed(parts, get_rule_fingerprint(rule, selection_cache))
+    for part in changed_parts:
+        state.record(part.pk, part.name, get_naming_diagnostics(part.name, rule))
+    state.prune(part.pk for part in parts)
+    state.save()
+    failing_pks = state.get_failing_pks()
+    export_parts_to_csv([part for part in parts if part.pk in failing_pks], csv_file_path, new_name_column)
+    logging.info(f"Re-checked {len(changed_parts)} of {len(parts)} part names, {len(failing_pks)} not compliant")
+
+def main(api, base_url, headers, rule_name, csv_file_path, new_name_column=True):
+    """
+    Main function to export parts to a CSV file.
+    """
+    # Check if the file is accessible
+    if not check_file_accessibility(csv_file_path):
+        return
+
+    mode = input("Select execution mode (1: all parts export, 2: parts not in line with the naming convention, 3: batch audit with per-segment failure matrix, 4: incremental check of changed parts): ")
+    if mode not in ('1', '2', '3', '4'):
+        logging.error("Invalid mode selected. Please select either 1, 2, 3 or 4.")
+        return
+
+    category_pk = load_naming_rules()[rule_name]['category']
+    parts = get_parts_in_category(api, category_pk)
+
+    if mode == '1':
+        export_parts_to_csv(parts, csv_file_path, new_name_column)
+        return
+
+    selection_cache = SelectionListCache(base_url, create_session(), headers)
+    rule = load_rule(rule_name, selection_cache)
+    if mode == '2':
+        export_non_compliant_parts(parts, rule, selection_cache, csv_file_path, new_name_column)
+    elif mode == '3':
+        audit_parts(parts, rule, csv_file_path, new_name_column)
+    else:
+        check_changed_parts(parts, rule, selection_cache, rule_name, base_url, csv_file_path, new_name_column)
@@ -0,0 +1,136 @@
+"""
+Declarative naming-rule engine for the part naming checks.
+
+Naming rules are read from naming_rules.json. A rule has a prefix and an ordered
+list of segments, all separated by '_'. Each segment is checked either against a
+regex or against the values of an InvenTree selection list:
+
+    "resistor": {
+        "category": 81,
+        "prefix": "R",
+        "allow_extra_segments": true,
+        "segments": [
+            {"name": "resistance", "regex": "\\d+(\\.\\d+)?(ROhm|kOhm|MOhm|mOhm)"},
+            {"name": "type", "selection_list": 15}
+        ]
+    }
+
+compile_rule turns a rule into a single anchored regex plus frozenset lookups for
+the selection list segments, so a compliant name is validated with one regex
+match and a few set lookups. Only names that fail are split again to produce
+per-segment diagnostics.
+"""
+import json
+import logging
+import os
+import re
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'naming_rules.json')
+
+def load_naming_rules(rules_path=DEFAULT_RULES_PATH):
+    """
+    Returns the rule configurations by rule name.
+    """
+    with open(rules_path, mode='r') as file:
+        return json.load(file)
+
+def get_selection_list_pks(rule_config):
+    """
+    Returns the pks of the selection lists a rule refers to.
+    """
+    return [segment['selection_list'] for segment in rule_config['segments'] if 'selection_list' in segment]
+
+class NamingRule:
+    """
+    A compiled naming rule. selection_choices maps each referenced selection
+    list pk to the set of its values.
+    """
+    def __init__(self, name, rule_config, selection_choices):
+        self.name = name
+        self.prefix = rule_config['prefix']
+        self.allow_extra_segments = rule_config.get('allow_extra_segments', False)
+        self.segments = []
+        group_patterns = []
+        for index, segment in enumerate(rule_config['segments']):
+            if 'selection_list' in segment:
+                allowed_values = frozenset(selection_choices.get(segment['selection_list'], ()))
+                pattern = None
+                group_patterns.append(f"(?P<s{index}>[^_]+)")
+            else:
+                allowed_values = None
+                pattern = re.compile(segment['regex'])
+                group_patterns.append(f"(?P<s{index}>(?:{segment['regex']}))")
+            self.segments.append((f"s{index}", segment, pattern, allowed_values))
+
+        extra = '(?:_.*)?' if self.allow_extra_segments else ''
+        self.regex = re.compile(f"^{re.escape(self.prefix)}_{'_'.join(group_patterns)}{extra}$")
+        self.set_segments = [(group, allowed_values) for group, _, _, allowed_values in self.segments if allowed_values is not None]
+
+    def is_compliant(self, part_name):
+        """
+        Fast path: one regex match plus the selection list set lookups.
+        """
+        match = self.regex.match(part_name)
+        if not match:
+            return False
+        for group, allowed_values in self.set_segments:
+            if match.group(group) not in allowed_values:
+                return False
+        return True
+
+    def segment_values(self, part_name):
+        """
+        Returns the segments of the name by segment name, None for missing ones.
+        """
+        parts = part_name.split('_')
+        return {
+            segment['name']: parts[index] if index < len(parts) else None
+            for index, (_, segment, _, _) in enumerate(self.segments, start=1)
+        }
+
+    def validate(self, part_name):
+        """
+        Returns the list of diagnostics for the name, empty if it is compliant.
+        """
+        if self.is_compliant(part_name):
+            return []
+
+        diagnostics = []
+        parts = part_name.split('_')
+        if parts[0] != self.prefix:
+            diagnostics.append(f"prefix '{parts[0]}' should be '{self.prefix}'")
+        expected_count = len(self.segments) + 1
+        if len(parts) < expected_count or (len(parts) > expected_count and not self.allow_extra_segments):
+            diagnostics.append(f"{len(parts)} segments, expected {expected_count}")
+        for index, (_, segment, pattern, allowed_values) in enumerate(self.segments, start=1):
+            if index >= len(parts):
+                diagnostics.append(f"segment {index} ({segment['name']}) is missing")
+            elif pattern is not None and not pattern.fullmatch(parts[index]):
+                diagnostics.append(f"segment {index} ({segment['name']}) '{parts[index]}' does not match {segment['regex']}")
+            elif allowed_values is not None and parts[index] not in allowed_values:
+                diagnostics.append(f"segment {index} ({segment['name']}) '{parts[index]}' is not in selection list {segment['selection_list']}")
+        return diagnostics or ["does not match the naming rule"]
+
+def compile_rule(name, rule_config, selection_choices):
+    return NamingRule(name, rule_config, selection_choices)
+
+def load_selection_choices(selection_cache, selection_list_pks):
+    """
+    Loads the values of the referenced selection lists once into frozensets.
+    """
+    selection_choices = {}
+    for selection_list_pk in selection_list_pks:
+        values = selection_cache.get_values(selection_list_pk)
+        if values is None:
+            logging.error(f'Failed to retrieve selection choices for list {selection_list_pk}')
+            values = frozenset()
+        selection_choices[selection_list_pk] = values
+    return selection_choices
+
+def load_rule(rule_name, selection_cache, rules_path=DEFAULT_RULES_PATH):
+    """
+    Compiles a configured rule with the values of its selection lists.
+    """
+    rule_config = load_naming_rules(rules_path)[rule_name]
+    selection_choices = load_selection_choices(selection_cache, get_selection_list_pks(rule_config))
+    return compile_rule(rule_name, rule_config, selection_choices)
@@ -0,0 +1,175 @@
+"""
+Two-phase plan/apply support for the update scripts.
+
+The "plan" step of a script reads its CSV plus a snapshot of the server and
+writes a JSONL file with one concrete operation per line:
+
+    {"seq": 0, "op": "update", "resource": "part/parameter", "pk": 812,
+     "payload": {"data": "10k"}, "label": "part 42 / Resistance"}
+    {"seq": 1, "op": "create", "resource": "part", "payload": {...},
+     "children": [{"resource": "company/part", "parent_field": "part", "payload": {...}}]}
+    {"seq": 2, "op": "skip", "label": "part 43 / Tolerance", "reason": "unchanged"}
+
+The file can be reviewed or edited before the "apply" step executes it with
+parallel workers. Apply appends the outcome of every operation to a status file
+next to the plan (<plan>_status.jsonl) as soon as it completes, so an interrupted
+apply leaves a record. Applying the same plan again skips the operations already
+marked done; a create whose parent was created but whose children failed
+continues with the remaining children instead of creating the parent again.
+
+    create  - POST {resource}/, then POST each child with the new pk set in
+              its parent_field
+    update  - PATCH {resource}/{pk}/
+    skip    - nothing is sent, the reason is kept for the review
+"""
+import json
+import logging
+import os
+import threading
+
+from _py_common.write_executor import run_concurrent
+
+def to_json_value(value):
+    """
+    JSON fallback for values read through pandas (numpy scalars and the like).
+    """
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+def get_plan_path(csv_path):
+    """
+    Plan file that goes with a CSV file (<csv>_plan.jsonl).
+    """
+    return f"{os.path.splitext(csv_path)[0]}_plan.jsonl"
+
+def write_plan(plan_path, operations):
+    """
+    Writes the operations to the plan file, numbering them in order. The status
+    file of a previous plan at the same path is removed, since its seqs refer
+    to other operations. Returns the number of operations of each kind.
+    """
+    status_path = get_status_path(plan_path)
+    if os.path.exists(status_path):
+        os.remove(status_path)
+    counts = {'create': 0, 'update': 0, 'skip': 0}
+    with open(plan_path, mode='w') as file:
+        for seq, operation in enumerate(operations):
+            operation = {'seq': seq, **operation}
+            counts[operation['op']] += 1
+            file.write(json.dumps(operation, default=to_json_value) + '\n')
+    return counts
+
+def read_plan(plan_path):
+    with open(plan_path, mode='r') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+def get_status_path(plan_path):
+    return f"{os.path.splitext(plan_path)[0]}_status.jsonl"
+
+def response_error(response):
+    return f"{response.status_code} - {response.text}"
+
+def read_statuses(status_path):
+    """
+    Returns the latest status record of every seq in an existing status file.
+    """
+    statuses = {}
+    if os.path.exists(status_path):
+        with open(status_path, mode='r') as file:
+            for line in file:
+                if line.strip():
+                    status = json.loads(line)
+                    statuses[status['seq']] = status
+    return statuses
+
+def apply_operation(operation, session, base_url, previous=None):
+    """
+    Executes one planned operation. Returns its status record.
+    previous is the status of an earlier failed attempt of the same operation.
+    """
+    status = {'seq': operation['seq'], 'op': operation['op'], 'label': operation.get('label', '')}
+    if operation['op'] == 'skip':
+        status['status'] = 'skipped'
+        return status
+
+    try:
+        if operation['op'] == 'update':
+            response = session.patch(f"{base_url}{operation['resource']}/{operation['pk']}/", json=operation['payload'])
+            if response.status_code != 200:
+                return {**status, 'status': 'failed', 'error': response_error(response)}
+            status['pk'] = operation['pk']
+        elif previous and previous.get('pk') is not None:
+            # The parent was created by an earlier attempt
+            status['pk'] = previous['pk']
+        else:
+            response = session.post(f"{base_url}{operation['resource']}/", json=operation['payload'])
+            if response.status_code != 201:
+                return {**status, 'status': 'failed', 'error': response_error(response)}
+            status['pk'] = response.json().get('pk')
+
+        children = operation.get('children', [])
+        status['children_done'] = previous.get('children_done', 0) if previous and operation['op'] == 'create' else 0
+        for child in children[status['children_done']:]:
+            payload = {**child['payload'], child['parent_field']: status['pk']}
+            response = session.post(f"{base_url}{child['resource']}/", json=payload)
+            if response.status_code != 201:
+                return {**status, 'status': 'failed', 'error': f"{child['resource']}: {response_error(response)}"}
+            status['children_done'] += 1
+    except Exception as e:
+        return {**status, 'status': 'failed', 'error': str(e)}
+
+    status['status'] = 'done'
+    return status
+
+def apply_plan(plan_path, session, base_url):
+    """
+    Executes the plan with the bounded write executor, appending each status to
+    the status file as it completes. Operations marked done by an earlier apply
+    of the plan are not sent again. The session must carry the authentication
+    headers. Returns the status records in plan order.
+    """
+    operations = read_plan(plan_path)
+    status_path = get_status_path(plan_path)
+    previous_statuses = read_statuses(status_path)
+    pending = [operation for operation in operations if previous_statuses.get(operation['seq'], {}).get('status') != 'done']
+    lock = threading.Lock()
+
+    with open(status_path, mode='a') as file:
+        def apply(operation):
+            status = apply_operation(operation, session, base_url, previous_statuses.get(operation['seq']))
+            with lock:
+                file.write(json.dumps(status) + '\n')
+                file.flush()
+            return status
+
+        applied = run_concurrent(apply, pending)
+
+    statuses = {status['seq']: status for status in previous_statuses.values() if status['status'] == 'done'}
+    statuses.update((status['seq'], status) for status in applied)
+    return [statuses[operation['seq']] for operation in operations]
+
+def summarize_statuses(statuses):
+    """
+    Returns the number of operations per status (done, failed, skipped).
+    """
+    summary = {'done': 0, 'failed': 0, 'skipped': 0}
+    for status in statuses:
+        summary[status['status']] += 1
+    return summary
+
+def apply_plan_and_report(plan_path, session, base_url):
+    """
+    Applies the plan file, logs the failed operations and prints the summary.
+    Returns the summary, or None if the plan file does not exist.
+    """
+    if not os.path.exists(plan_path):
+        print(f"Plan file '{plan_path}' not found. Please create it first with the plan option.")
+        return None
+    statuses = apply_plan(plan_path, session, base_url)
+    for status in statuses:
+        if status['status'] == 'failed':
+            logging.error(f"Failed operation {status['seq']} ({status['label']}): {status['error']}")
+    summary = summarize_statuses(statuses)
+    print(f"Plan applied: {summary['done']} done, {summary['failed']} failed, {summary['skipped']} skipped.")
+    return summary
@@ -0,0 +1,39 @@
+"""
+Bulk retrieval of InvenTree parts by pk.
+
+Instead of one Part(api, pk=...) GET per row, the parts referenced by a CSV are
+listed in chunks of PK_CHUNK_SIZE pks with a pk__in filter. If the server does
+not support the filter it answers with the unfiltered part list; this is
+detected from pks outside the requested chunk, the wanted parts are taken from
+that response and no further chunks are requested.
+"""
+import logging
+
+from inventree.part import Part
+
+PK_CHUNK_SIZE = 200
+
+def get_part_url(part_pk):
+    """
+    Detail URL of a part, relative to the API root.
+    """
+    return f"{Part.URL.strip('/')}/{part_pk}/"
+
+def fetch_parts_by_pk(api, part_pks, chunk_size=PK_CHUNK_SIZE):
+    """
+    Returns a map of pk to Part for the given pks.
+    Pks that do not exist on the server are missing from the map.
+    """
+    wanted = sorted(set(part_pks))
+    parts = {}
+    for start in range(0, len(wanted), chunk_size):
+        chunk = set(wanted[start:start + chunk_size])
+        results = Part.list(api, pk__in=','.join(str(pk) for pk in sorted(chunk)))
+        if any(part.pk not in chunk for part in results):
+            logging.debug("pk__in filter not supported by the server, using the full part list")
+            wanted_set = set(wanted)
+            parts.update({part.pk: part for part in results if part.pk in wanted_set})
+            break
+        parts.update({part.pk: part for part in results})
+    logging.info(f"Retrieved {len(parts)} of {len(wanted)} parts")
+    return parts
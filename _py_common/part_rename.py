@@ -0,0 +1,254 @@
+"""
+Rename tool shared by the _py_*_name_update.py scripts.
+
+The CSV lists pk, description and the new name of every part to rename. All
+referenced parts are fetched once in bulk (see part_fetch.py) and the same
+objects serve the preview and the apply step. The confirmed renames are sent as
+PATCH requests through the bounded write executor (WRITE_CONCURRENCY and
+WRITE_RATE_LIMIT in the .env file).
+
+Before anything is written every row is classified:
+
+    rename            - the new name is set and differs from the current name
+    description-only  - the name stays, only the description differs
+    no-op             - nothing differs (a blank new name keeps the current name)
+    invalid           - the pk is not a number, the part does not exist or
+                        the pk appears in more than one row
+
+Only renames and description-only rows are sent, each with just the fields
+that changed. The column holding the new name differs per script, so it is
+passed as new_name_column.
+
+Before the changes are applied, the previous values of the changed fields are
+written to a rollback journal in _executed (<csv>_<timestamp>_rollback.jsonl,
+one {"pk": ..., "before": {...}} line per part), taken from the parts already
+fetched for the preview. The rollback mode replays a journal concurrently
+without any GET request.
+"""
+import glob
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+
+import pandas as pd
+
+from _py_common.part_fetch import fetch_parts_by_pk, get_part_url
+from _py_common.write_executor import run_concurrent
+
+def collect_info_from_csv(file_path):
+    """
+    Reads the CSV file and returns a DataFrame with the part information.
+    """
+    logging.info("Reading CSV file")
+    df = pd.read_csv(file_path)
+    df = df.fillna('').infer_objects(copy=False)
+    logging.info("CSV file read successfully")
+    return df
+
+EXECUTED_FOLDER = '_executed'
+
+def duplicate_file_with_timestamp(file_path, subfolder, timestamp=None):
+    """
+    Duplicates the file with a timestamp in the name and stores it in the specified subfolder.
+    """
+    if not os.path.exists(subfolder):
+        os.makedirs(subfolder)
+
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    base_name = os.path.basename(file_path)
+    new_file_name = f"{os.path.splitext(base_name)[0]}_{timestamp}{os.path.splitext(base_name)[1]}"
+    new_file_path = os.path.join(subfolder, new_file_name)
+
+    shutil.copy2(file_path, new_file_path)
+    logging.info(f"File duplicated to {new_file_path}")
+
+ROW_KINDS = ('rename', 'description-only', 'no-op', 'invalid')
+
+def classify_row(row, parts, new_name_column):
+    """
+    Classifies one CSV row. Returns the change with its kind and the payload
+    of the fields that differ.
+    """
+    try:
+        part_pk = int(row['pk'])
+    except (TypeError, ValueError):
+        return {'pk': row['pk'], 'kind': 'invalid', 'reason': 'pk is not a number'}
+    part = parts.get(part_pk)
+    if part is None:
+        return {'pk': part_pk, 'kind': 'invalid', 'reason': 'part not found'}
+
+    new_name = str(row[new_name_column]).strip()
+    new_description = str(row['description'])
+    payload = {}
+    if new_name and new_name != part.name:
+        payload['name'] = new_name
+    if new_description != (part.description or ''):
+        payload['description'] = new_description
+
+    if 'name' in payload:
+        kind = 'rename'
+    elif payload:
+        kind = 'description-only'
+    else:
+        kind = 'no-op'
+    return {
+        'pk': part_pk,
+        'kind': kind,
+        'payload': payload,
+        'existing_name': part.name,
+        'existing_description': part.description,
+        'new_name': payload.get('name', part.name),
+        'new_description': new_description
+    }
+
+def classify_changes(parts_info, parts, new_name_column):
+    """
+    Classifies all CSV rows. Returns the changes and the number of rows per kind.
+    """
+    # Repeated pks would be written concurrently and the last write would win,
+    # so all rows of a repeated pk are left out
+    row_pks = pd.to_numeric(parts_info['pk'], errors='coerce')
+    pk_counts = row_pks.value_counts()
+    changes = []
+    for (_, row), part_pk in zip(parts_info.iterrows(), row_pks):
+        if pd.notna(part_pk) and pk_counts[part_pk] > 1:
+            changes.append({'pk': int(part_pk), 'kind': 'invalid', 'reason': f"pk appears in {pk_counts[part_pk]} rows"})
+        else:
+            changes.append(classify_row(row, parts, new_name_column))
+    counts = {kind: 0 for kind in ROW_KINDS}
+    for change in changes:
+        counts[change['kind']] += 1
+        if change['kind'] == 'invalid':
+            logging.error(f"Row with pk {change['pk']} skipped: {change['reason']}")
+    return changes, counts
+
+def print_changes(changes):
+    print("The following changes will be made:")
+    for change in changes:
+        print(f"Part ID: {change['pk']} ({change['kind']})")
+        print(f"  Existing name: {change['existing_name']}")
+        print(f"  Existing description: {change['existing_description']}")
+        print(f"  New name: {change['new_name']}")
+        print(f"  New description: {change['new_description']}")
+        print()
+
+def update_part_information(api, part_pk, part_data):
+    """
+    Sends the new part information with a single PATCH request.
+    Returns True if successful.
+    """
+    try:
+        api.patch(get_part_url(part_pk), part_data)
+        logging.info(f"Updated part {part_pk}: {', '.join(part_data)}")
+        return True
+    except Exception as e:
+        logging.error(f"Error updating part {part_pk}: {e}")
+        return False
+
+def apply_changes(api, changes):
+    """
+    Applies the changes concurrently. Returns the number of failed updates.
+    """
+    def apply(change):
+        return update_part_information(api, change['pk'], change['payload'])
+
+    results = run_concurrent(apply, changes)
+    return results.count(False)
+
+def get_rollback_journal_path(file_path, subfolder, timestamp):
+    base_name = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(subfolder, f"{base_name}_{timestamp}_rollback.jsonl")
+
+def write_rollback_journal(changes, journal_path):
+    """
+    Writes the previous values of the fields each change modifies.
+    """
+    os.makedirs(os.path.dirname(journal_path), exist_ok=True)
+    with open(journal_path, mode='w') as file:
+        for change in changes:
+            before = {}
+            if 'name' in change['payload']:
+                before['name'] = change['existing_name']
+            if 'description' in change['payload']:
+                before['description'] = change['existing_description'] or ''
+            file.write(json.dumps({'pk': change['pk'], 'before': before}) + '\n')
+    logging.info(f"Rollback journal written to {journal_path}")
+
+def rollback(api, journal_path):
+    """
+    Restores the previous names and descriptions recorded in a rollback journal.
+    """
+    with open(journal_path, mode='r') as file:
+        entries = [json.loads(line) for line in file if line.strip()]
+    if not entries:
+        logging.info(f"Rollback journal {journal_path} is empty")
+        return
+
+    confirmation = input(f"Do you want to restore {len(entries)} parts from {journal_path}? (yes/no): ")
+    if confirmation.lower() != 'yes':
+        logging.info("Rollback aborted by user")
+        return
+
+    results = run_concurrent(lambda entry: update_part_information(api, entry['pk'], entry['before']), entries)
+    failed = results.count(False)
+    logging.info(f"Rollback completed: {len(entries) - failed} restored, {failed} failed")
+
+def select_rollback_journal(csv_file_path, subfolder=EXECUTED_FOLDER):
+    """
+    Asks for the journal to roll back, proposing the latest one of the CSV file.
+    """
+    base_name = os.path.splitext(os.path.basename(csv_file_path))[0]
+    journals = sorted(glob.glob(os.path.join(subfolder, f"{base_name}_*_rollback.jsonl")))
+    latest = journals[-1] if journals else None
+    journal_path = input(f"Rollback journal to replay [{latest or 'none found'}]: ").strip() or latest
+    if not journal_path or not os.path.exists(journal_path):
+        logging.error("No rollback journal found")
+        return None
+    return journal_path
+
+def rename_parts(csv_file_path, api, new_name_column='new_name'):
+    """
+    Updates the part names and descriptions based on the CSV file.
+    """
+    parts_info = collect_info_from_csv(csv_file_path)
+    part_pks = [int(pk) for pk in pd.to_numeric(parts_info['pk'], errors='coerce').dropna()]
+    parts = fetch_parts_by_pk(api, part_pks)
+    changes, counts = classify_changes(parts_info, parts, new_name_column)
+    changes = [change for change in changes if change['kind'] in ('rename', 'description-only')]
+
+    if not changes:
+        logging.info(f"Nothing to update: {counts['no-op']} unchanged rows, {counts['invalid']} invalid rows")
+        return
+
+    print_changes(changes)
+
+    summary = ', '.join(f"{counts[kind]} {kind}" for kind in ROW_KINDS)
+    confirmation = input(f"Do you want to apply these changes ({summary})? (yes/no): ")
+
+    if confirmation.lower() == 'yes':
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        write_rollback_journal(changes, get_rollback_journal_path(csv_file_path, EXECUTED_FOLDER, timestamp))
+
+        failed = apply_changes(api, changes)
+        logging.info(f"Update process completed: {len(changes) - failed} updated, {failed} failed")
+
+        # Duplicate the CSV file with a timestamp and store it in the _executed subfolder
+        duplicate_file_with_timestamp(csv_file_path, EXECUTED_FOLDER, timestamp)
+    else:
+        logging.info("Update process aborted by user")
+
+def main(csv_file_path, api, new_name_column='new_name'):
+    """
+    Runs the rename from the CSV file or the rollback of a previous run.
+    """
+    mode = input("Select execution mode (1: update from CSV, 2: rollback a previous update): ")
+    if mode == '1':
+        rename_parts(csv_file_path, api, new_name_column)
+    elif mode == '2':
+        journal_path = select_rollback_journal(csv_file_path)
+        if journal_path:
+            rollback(api, journal_path)
+    else:
+        logging.error("Invalid mode selected. Please select either 1 or 2.")
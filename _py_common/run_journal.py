@@ -0,0 +1,81 @@
+"""
+Append-only checkpoint journal for resumable update runs.
+
+Every completed (part, field) operation is written as one JSON line to a journal
+file named after the input file and a hash of its content. When a run is
+restarted on the same, unmodified input file, the journaled operations are
+skipped and the run continues from where it stopped. Editing the input file
+changes the hash and therefore starts a fresh journal.
+
+The journal is removed once a run finishes without errors, so a later run of
+the same file is applied again from the top.
+"""
+import hashlib
+import json
+import os
+import threading
+
+JOURNAL_DIR = '_journal'
+
+def hash_file(file_path):
+    """
+    Returns the SHA-256 hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class RunJournal:
+    """
+    Journal of the completed operations of one input file. Thread-safe, so
+    workers of the write executor can record their results directly.
+    """
+    def __init__(self, input_path, journal_dir=JOURNAL_DIR):
+        if not os.path.exists(journal_dir):
+            os.makedirs(journal_dir)
+        base_name = os.path.splitext(os.path.basename(input_path))[0]
+        self.path = os.path.join(journal_dir, f"{base_name}_{hash_file(input_path)[:16]}.jsonl")
+        self.completed = set()
+        if os.path.exists(self.path):
+            with open(self.path, mode='r') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A run killed mid-write can leave a truncated last line
+                        continue
+                    self.completed.add((entry['part'], entry['field']))
+        self.lock = threading.Lock()
+        self.file = open(self.path, mode='a')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def is_done(self, part, field):
+        return (str(part), str(field)) in self.completed
+
+    def record(self, part, field):
+        """
+        Marks the operation as completed and flushes it to disk immediately.
+        """
+        key = (str(part), str(field))
+        with self.lock:
+            if key in self.completed:
+                return
+            self.completed.add(key)
+            self.file.write(json.dumps({'part': key[0], 'field': key[1]}) + '\n')
+            self.file.flush()
+
+    def close(self, finished=False):
+        """
+        Closes the journal. A finished run removes it.
+        """
+        if not self.file.closed:
+            self.file.close()
+        if finished and os.path.exists(self.path):
+            os.remove(self.path)
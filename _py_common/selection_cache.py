@@ -0,0 +1,121 @@
+"""
+Persistent on-disk cache of the InvenTree selection lists.
+
+All selection lists of a server are downloaded with a single request and stored
+in one JSON file per server URL, keyed by list pk. The file lives in the _cache
+folder at the root of the repository, so it is reused across runs and across
+scripts. While the cache is younger than its TTL no request is sent at all; once
+it expires, the next lookup refreshes every list with one request.
+
+Each list also records a version (its last_updated timestamp when the server
+provides one, otherwise a hash of its values), so callers can tell whether a
+list changed since they last used it.
+
+The TTL can be set in the .env file with SELECTION_CACHE_TTL (seconds, default
+3600). Scripts that modify selection lists call invalidate() afterwards. Changes
+made in the InvenTree UI are only seen once the TTL expires; set
+SELECTION_CACHE_REFRESH=1 to download the lists again on the first lookup of a
+run regardless of the TTL.
+"""
+import hashlib
+import json
+import os
+import time
+
+DEFAULT_TTL = 3600
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '_cache')
+
+def get_values_version(values):
+    return hashlib.sha1('\n'.join(sorted(values)).encode()).hexdigest()[:16]
+
+class SelectionListCache:
+    """
+    Selection lists of one server, with set-based lookups.
+    """
+    def __init__(self, base_url, session, headers=None, ttl=None, cache_dir=CACHE_DIR):
+        self.base_url = base_url
+        self.session = session
+        self.headers = headers
+        self.ttl = ttl if ttl is not None else float(os.getenv('SELECTION_CACHE_TTL', DEFAULT_TTL))
+        server_key = hashlib.sha1(base_url.encode()).hexdigest()[:12]
+        self.path = os.path.join(cache_dir, f"selection_lists_{server_key}.json")
+        self.request_count = 0
+        self.data = None
+        self.value_sets = {}
+        self.force_refresh = os.getenv('SELECTION_CACHE_REFRESH', '').lower() in ('1', 'true', 'yes')
+
+    def load(self):
+        """
+        Loads the cache file, refreshing it from the server when it is missing
+        or expired. Returns False if the lists could not be retrieved.
+        """
+        if self.force_refresh:
+            self.force_refresh = False
+            return self.refresh()
+        if self.data is None and os.path.exists(self.path):
+            try:
+                with open(self.path, mode='r') as file:
+                    self.set_data(json.load(file))
+            except ValueError:
+                self.data = None
+        if self.data is not None and time.time() - self.data['fetched_at'] < self.ttl:
+            return True
+        return self.refresh()
+
+    def refresh(self):
+        """
+        Downloads all selection lists with one request and rewrites the cache file.
+        """
+        response = self.session.get(f"{self.base_url}selection/", headers=self.headers)
+        self.request_count += 1
+        if response.status_code != 200:
+            return False
+        lists = {}
+        for selection_list in response.json():
+            values = [choice['value'] for choice in selection_list['choices']]
+            lists[str(selection_list['pk'])] = {
+                'name': selection_list.get('name', ''),
+                'values': values,
+                'version': selection_list.get('last_updated') or get_values_version(values)
+            }
+        self.set_data({'base_url': self.base_url, 'fetched_at': time.time(), 'lists': lists})
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, mode='w') as file:
+            json.dump(self.data, file)
+        return True
+
+    def set_data(self, data):
+        self.data = data
+        self.value_sets = {int(pk): frozenset(entry['values']) for pk, entry in data['lists'].items()}
+
+    def invalidate(self):
+        """
+        Drops the cached lists so the next lookup downloads them again.
+        """
+        self.data = None
+        self.value_sets = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def get_all(self):
+        """
+        Returns a map of selection list pk to the frozenset of its values,
+        or None if the lists could not be retrieved.
+        """
+        if not self.load():
+            return None
+        return self.value_sets
+
+    def get_values(self, selection_list_pk):
+        """
+        Returns the frozenset of values of one list, or None if it does not exist.
+        """
+        if not self.load():
+            return None
+        return self.value_sets.get(int(selection_list_pk))
+
+    def get_version(self, selection_list_pk):
+        if not self.load():
+            return None
+        entry = self.data['lists'].get(str(selection_list_pk))
+        return entry['version'] if entry else None
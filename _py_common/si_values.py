@@ -0,0 +1,92 @@
+"""
+SI value parsing and numeric indexes for the value segments of part names.
+
+parse_si_value turns segments such as '10kOhm', '4k7Ohm', '100nF', '20mA' or
+'3.2V' into a canonical float in the base unit plus the unit:
+
+    parse_si_value('100nF')  -> (1e-07, 'F')
+    parse_si_value('0.1uF')  -> (1e-07, 'F')
+    parse_si_value('4k7Ohm') -> (4700.0, 'Ohm')
+
+Supported prefixes are p, n, u, µ, m, k, M, G and R (no scaling, as in '1ROhm'),
+supported units are Ohm, F, A and V. The scaling is done in decimal, so equal
+values written differently map to the same float. Results are memoised, since
+the same few hundred values repeat across a whole part library.
+
+NumericIndex keeps (value, pk) pairs sorted for O(log n) range queries:
+
+    index = build_segment_index(parts, rule, 'resistance', group_segment='mounting')
+    index['SMD'].range(9.9e3, 10.1e3)   -> pks of the SMD resistors from 9.9k to 10.1k
+"""
+import re
+from bisect import bisect_left, bisect_right
+from decimal import Decimal
+from functools import lru_cache
+
+PREFIX_EXPONENTS = {'p': -12, 'n': -9, 'u': -6, 'µ': -6, 'm': -3, 'R': 0, 'k': 3, 'M': 6, 'G': 9}
+UNITS = ('Ohm', 'F', 'A', 'V')
+
+_prefixes = ''.join(PREFIX_EXPONENTS)
+_units = '|'.join(UNITS)
+# 10kOhm, 3.2V, 20mA
+SI_VALUE_PATTERN = re.compile(rf"(\d+(?:\.\d+)?)([{_prefixes}])?({_units})")
+# 4k7Ohm, 2u2F: the prefix takes the place of the decimal point
+RKM_VALUE_PATTERN = re.compile(rf"(\d*)([{_prefixes}])(\d+)({_units})")
+
+@lru_cache(maxsize=65536)
+def parse_si_value(segment):
+    """
+    Returns (value, unit) for a value segment, or None if it is not a value.
+    """
+    match = SI_VALUE_PATTERN.fullmatch(segment)
+    if match:
+        number, prefix, unit = match.groups()
+    else:
+        match = RKM_VALUE_PATTERN.fullmatch(segment)
+        if not match or not (match.group(1) or match.group(3)):
+            return None
+        whole, prefix, fraction, unit = match.groups()
+        number = f"{whole or '0'}.{fraction}"
+    exponent = PREFIX_EXPONENTS[prefix] if prefix else 0
+    return float(Decimal(number).scaleb(exponent)), unit
+
+class NumericIndex:
+    """
+    Sorted (value, pk) pairs with bisect range lookups.
+    """
+    def __init__(self, entries=()):
+        entries = sorted(entries)
+        self.values = [value for value, _ in entries]
+        self.pks = [pk for _, pk in entries]
+
+    def __len__(self):
+        return len(self.values)
+
+    def range(self, low, high):
+        """
+        Returns the pks with low <= value <= high.
+        """
+        return self.pks[bisect_left(self.values, low):bisect_right(self.values, high)]
+
+    def exact(self, value):
+        return self.range(value, value)
+
+def build_segment_index(parts, rule, segment_name, group_segment=None):
+    """
+    Builds a numeric index of one value segment from (pk, name) pairs.
+    Names whose segment is not a value are left out. With group_segment, one
+    index is built per value of that segment (e.g. per mounting or package)
+    and a map of group value to index is returned.
+    """
+    groups = {}
+    for pk, part_name in parts:
+        segments = rule.segment_values(part_name)
+        parsed = parse_si_value(segments[segment_name]) if segments[segment_name] else None
+        if parsed is None:
+            continue
+        group = segments[group_segment] if group_segment else None
+        groups.setdefault(group, []).append((parsed[0], pk))
+
+    if group_segment is None:
+        return NumericIndex(groups.get(None, []))
+    return {group: NumericIndex(entries) for group, entries in groups.items()}
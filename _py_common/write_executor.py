@@ -0,0 +1,76 @@
+"""
+Bounded, rate limited executor for InvenTree write requests.
+
+Writes are dispatched to a thread pool with a fixed number of workers, and a
+shared rate limiter spaces the requests so the server never sees more than the
+configured number of requests per second. Results are returned in the same order
+as the input, so callers can log them in CSV row order. An exception raised for
+one item (e.g. a ConnectionError once the retries are exhausted) does not abort
+the batch: it is returned in place of that item's result, so callers count it
+with their other failures.
+
+The defaults can be set in the .env file:
+    WRITE_CONCURRENCY  - number of writes in flight (default 8)
+    WRITE_RATE_LIMIT   - maximum writes per second, 0 disables the limit (default 20)
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE_LIMIT = 20
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces calls evenly to at most `rate` per second.
+    """
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+def get_write_settings():
+    """
+    Returns the (concurrency, rate limit) configured in the environment.
+    """
+    concurrency = int(os.getenv('WRITE_CONCURRENCY', DEFAULT_CONCURRENCY))
+    rate_limit = float(os.getenv('WRITE_RATE_LIMIT', DEFAULT_RATE_LIMIT))
+    return max(1, concurrency), rate_limit
+
+def run_concurrent(func, items, max_workers=None, requests_per_second=None):
+    """
+    Calls func(item) for every item on a bounded worker pool.
+    Returns the results in the order of the input items; an item whose call
+    raised an exception gets the exception instance as its result.
+    """
+    default_workers, default_rate = get_write_settings()
+    max_workers = max_workers or default_workers
+    if requests_per_second is None:
+        requests_per_second = default_rate
+    limiter = RateLimiter(requests_per_second)
+
+    def limited_call(item):
+        limiter.wait()
+        try:
+            return func(item)
+        except Exception as e:
+            return e
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        return list(executor.map(limited_call, items))
+    finally:
+        # On Ctrl-C or an error, drop the queued calls instead of sending them
+        executor.shutdown(wait=True, cancel_futures=True)
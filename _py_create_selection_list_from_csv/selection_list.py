@@ -8,6 +8,7 @@ It performs the following steps:
 
 2. Define Headers for Authentication:
    - The script sets up the headers required for authentication with the InvenTree API using the API token.
+   - Requests go through a shared session that reuses connections and retries transient failures with backoff.
 
 3. Define Function to Create a Selection List with Choices:
    - The `create_selection_list_with_choices` function sends a POST request to the InvenTree API to create a selection list along with its choices.
@@ -38,9 +39,13 @@ Overall, this script automates the process of creating a selection list with cho
 """
 
 import csv
-import requests
-from dotenv import load_dotenv
 import os
+import sys
+from dotenv import load_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _py_common.inventree_session import create_session
+from _py_common.selection_cache import SelectionListCache
 
 # Load environment variables from .env file
 load_dotenv()
@@ -55,6 +60,12 @@ headers = {
     'Content-Type': 'application/json'
 }
 
+# Pooled keep-alive session with timeouts and retries
+session = create_session()
+
+# Cached selection lists used by the other scripts
+selection_cache = SelectionListCache(api_url, session, headers)
+
 # Function to create a selection list with choices
 def create_selection_list_with_choices(name, description, choices):
     url = f'{api_url}selection/'
@@ -64,10 +75,12 @@ def create_selection_list_with_choices(name, description, choices):
         'active': True,
         'choices': choices
     }
-    response = requests.post(url, headers=headers, json=payload)
+    response = session.post(url, headers=headers, json=payload)
     
     if response.status_code == 201:
         print('Selection list created successfully with choices!')
+        # Let the other scripts pick up the change
+        selection_cache.invalidate()
         return response.json()
     else:
         print(f'Failed to create selection list: {response.status_code}')
@@ -0,0 +1,229 @@
+"""
+Naming audit of several categories in a single run.
+
+The categories to audit and the naming rule of each come from the "category"
+field of _py_common/naming_rules.json, or from NAMING_AUDIT_CATEGORIES in the
+.env file (e.g. "81=resistor,82=capacitor,80=led"). The part lists of all
+categories are fetched concurrently, the selection lists are loaded once through
+the shared cache, and the names are audited in parallel worker processes.
+
+The run writes one consolidated failure matrix (naming_audit.csv, or .parquet
+with AUDIT_REPORT_FORMAT) with a category and rule column per part, plus the
+per-category timings (naming_audit_timings.csv).
+
+The duplicate detection mode groups the parts of all categories by their
+normalised name segments (see _py_common/duplicates.py) and writes the clusters
+of likely duplicates to naming_audit_duplicates.csv.
+
+The range query mode builds a sorted numeric index of one value segment per
+category (see _py_common/si_values.py) and writes the parts whose value lies in
+the given range, optionally restricted to one value of another segment (e.g. all
+SMD resistors from 9.9kOhm to 10.1kOhm), to naming_audit_range.csv.
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from dotenv import load_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _py_common.duplicates import find_duplicate_clusters
+from _py_common.inventree_async import AsyncInvenTreeClient, AsyncInvenTreeError
+from _py_common.inventree_session import create_session
+from _py_common.naming_audit import audit_category, write_audit_report
+from _py_common.naming_rules import load_naming_rules, load_rule
+from _py_common.selection_cache import SelectionListCache
+from _py_common.si_values import NumericIndex, build_segment_index, parse_si_value
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Retrieve API details from environment variables
+api_url = os.getenv('BASE_URL')
+token = os.getenv('INVENTREE_API_TOKEN')
+
+# Headers for authentication
+headers = {
+    'Authorization': f'Token {token}',
+    'Content-Type': 'application/json'
+}
+
+REPORT_PATH = f"naming_audit.{os.getenv('AUDIT_REPORT_FORMAT', 'csv')}"
+TIMINGS_PATH = 'naming_audit_timings.csv'
+DUPLICATES_PATH = 'naming_audit_duplicates.csv'
+RANGE_PATH = 'naming_audit_range.csv'
+
+def get_category_rules():
+    """
+    Returns the mapping of category pk to rule name.
+    """
+    configured = os.getenv('NAMING_AUDIT_CATEGORIES')
+    if configured:
+        category_rules = {}
+        for entry in configured.split(','):
+            category_pk, rule_name = entry.split('=')
+            category_rules[int(category_pk)] = rule_name.strip()
+        return category_rules
+    return {rule_config['category']: rule_name for rule_name, rule_config in load_naming_rules().items()}
+
+async def fetch_category_parts(category_pks):
+    """
+    Fetches the part lists of all categories concurrently.
+    Returns a map of category pk to ((pk, name) list, fetch time) and the request count.
+    """
+    async with AsyncInvenTreeClient(api_url, token) as client:
+        async def fetch(category_pk):
+            start = time.perf_counter()
+            parts = await client.list_parts(category_pk)
+            logging.info(f"Retrieved {len(parts)} parts in category {category_pk}")
+            return [(part['pk'], part['name']) for part in parts], time.perf_counter() - start
+
+        results = await asyncio.gather(*(fetch(category_pk) for category_pk in category_pks))
+    return dict(zip(category_pks, results)), client.request_count
+
+def load_rules(category_rules):
+    """
+    Compiles every referenced rule once, with one selection list cache for all.
+    """
+    selection_cache = SelectionListCache(api_url, create_session(), headers)
+    rules = {rule_name: load_rule(rule_name, selection_cache) for rule_name in set(category_rules.values())}
+    return selection_cache, rules
+
+def audit_categories(category_rules, category_parts):
+    """
+    Audits all configured categories and writes the consolidated report.
+    """
+    selection_cache, rules = load_rules(category_rules)
+
+    max_workers = min(len(category_rules), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            category_pk: executor.submit(audit_category, rules[rule_name], category_parts[category_pk][0])
+            for category_pk, rule_name in category_rules.items()
+        }
+        audits = {category_pk: future.result() for category_pk, future in futures.items()}
+
+    matrices = []
+    timings = []
+    for category_pk, rule_name in category_rules.items():
+        matrix, audit_time = audits[category_pk]
+        parts, fetch_time = category_parts[category_pk]
+        non_compliant = int((matrix['failures'] > 0).sum())
+        matrix.insert(0, 'rule', rule_name)
+        matrix.insert(0, 'category', category_pk)
+        matrices.append(matrix)
+        timings.append({
+            'category': category_pk,
+            'rule': rule_name,
+            'parts': len(parts),
+            'non_compliant': non_compliant,
+            'fetch_s': round(fetch_time, 3),
+            'audit_s': round(audit_time, 3)
+        })
+        logging.info(f"Category {category_pk} ({rule_name}): {non_compliant}/{len(parts)} not compliant, fetched in {fetch_time:.2f}s, audited in {audit_time:.2f}s")
+
+    write_audit_report(pd.concat(matrices, ignore_index=True), REPORT_PATH)
+    pd.DataFrame(timings).to_csv(TIMINGS_PATH, index=False)
+    logging.info(f"Loaded the selection lists with {selection_cache.request_count} requests")
+    logging.info(f"Report written to {REPORT_PATH}, timings written to {TIMINGS_PATH}")
+
+def detect_duplicates(category_parts):
+    """
+    Writes the clusters of likely duplicate parts across all categories.
+    """
+    parts = {category_pk: category_parts[category_pk][0] for category_pk in category_parts}
+    clusters = find_duplicate_clusters(parts)
+    rows = [
+        {'cluster': cluster_id, 'category': category_pk, 'pk': pk, 'name': part_name}
+        for cluster_id, members in enumerate(clusters, start=1)
+        for category_pk, pk, part_name in members
+    ]
+    pd.DataFrame(rows, columns=['cluster', 'category', 'pk', 'name']).to_csv(DUPLICATES_PATH, index=False)
+    logging.info(f"Found {len(clusters)} clusters of likely duplicates ({len(rows)} parts), written to {DUPLICATES_PATH}")
+
+def parse_query_value(text):
+    """
+    Parses a range bound given as SI value (9.9kOhm) or plain number (9900).
+    """
+    parsed = parse_si_value(text.strip())
+    return parsed[0] if parsed else float(text)
+
+def ask_range_query():
+    """
+    Asks for the value segment, the range and the optional segment filter.
+    Returns None if a bound cannot be parsed.
+    """
+    segment_name = input("Value segment to query (e.g. resistance): ").strip()
+    try:
+        low = parse_query_value(input("Lower bound (e.g. 9.9kOhm): "))
+        high = parse_query_value(input("Upper bound (e.g. 10.1kOhm): "))
+    except ValueError as e:
+        logging.error(f"Invalid range bound: {e}")
+        return None
+    group_filter = input("Optional filter as segment=value (e.g. mounting=SMD), blank for none: ").strip()
+    group_segment, group_value = group_filter.split('=', 1) if '=' in group_filter else (None, None)
+    return segment_name, low, high, group_segment, group_value
+
+def query_value_range(category_rules, category_parts, query):
+    """
+    Writes the parts whose value segment lies in the queried range.
+    """
+    segment_name, low, high, group_segment, group_value = query
+    _, rules = load_rules(category_rules)
+    rows = []
+    for category_pk, rule_name in category_rules.items():
+        rule = rules[rule_name]
+        segment_names = {segment['name'] for _, segment, _, _ in rule.segments}
+        if segment_name not in segment_names or (group_segment and group_segment not in segment_names):
+            continue
+        parts, _ = category_parts[category_pk]
+        index = build_segment_index(parts, rule, segment_name, group_segment)
+        if group_segment:
+            index = index.get(group_value, NumericIndex())
+        part_names = dict(parts)
+        for pk in index.range(low, high):
+            rows.append({'category': category_pk, 'rule': rule_name, 'pk': pk, 'name': part_names[pk]})
+
+    pd.DataFrame(rows, columns=['category', 'rule', 'pk', 'name']).to_csv(RANGE_PATH, index=False)
+    logging.info(f"Found {len(rows)} parts with {segment_name} from {low:g} to {high:g}, written to {RANGE_PATH}")
+
+def main():
+    """
+    Fetches the parts of all configured categories and runs the selected mode.
+    """
+    mode = input("Select execution mode (1: naming audit, 2: duplicate detection, 3: value range query): ")
+    if mode not in ('1', '2', '3'):
+        logging.error("Invalid mode selected. Please select either 1, 2 or 3.")
+        return
+    if mode == '3':
+        query = ask_range_query()
+        if query is None:
+            return
+
+    start = time.perf_counter()
+    category_rules = get_category_rules()
+
+    try:
+        category_parts, request_count = asyncio.run(fetch_category_parts(list(category_rules)))
+    except AsyncInvenTreeError as e:
+        logging.error(f"Failed to retrieve the parts: {e}")
+        return
+
+    if mode == '1':
+        audit_categories(category_rules, category_parts)
+    elif mode == '2':
+        detect_duplicates(category_parts)
+    else:
+        query_value_range(category_rules, category_parts, query)
+    logging.info(f"Processed {len(category_rules)} categories in {time.perf_counter() - start:.2f}s with {request_count} part list requests")
+
+if __name__ == "__main__":
+    if not token:
+        raise ValueError("API token not found in secrets file.")
+    main()
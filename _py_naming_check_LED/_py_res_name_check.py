@@ -1,12 +1,12 @@
-import csv
 import logging
-import re
-import requests
+import sys
 from inventree.api import InvenTreeAPI
-from inventree.part import Part
 import os
 from dotenv import load_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _py_common.naming_check import main
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -29,137 +29,9 @@ headers = {
 # Initialize the InvenTree API
 api = InvenTreeAPI(api_url, token=token)
 
-def check_file_accessibility(file_path):
-    """
-    Checks if the file is accessible for writing.
-    """
-    try:
-        with open(file_path, 'w') as file:
-            pass
-    except PermissionError:
-        logging.error(f"Permission denied: {file_path}. Please close the file if it is open and try again.")
-        return False
-    return True
-
-def get_parts_in_category(api, category_pk):
-    """
-    Retrieves all parts in the specified category.
-    """
-    logging.info(f"Retrieving parts in category {category_pk}")
-    parts = Part.list(api, category=category_pk)
-    logging.info(f"Retrieved {len(parts)} parts")
-    return parts
-
-def export_parts_to_csv(parts, file_path):
-    """
-    Exports the parts to a CSV file with columns: pk, name, description, new_name.
-    """
-    with open(file_path, mode='w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(['pk', 'name', 'description', 'new_name'])
-        for part in parts:
-            writer.writerow([part.pk, part.name, part.description])
-    logging.info(f"Parts exported to {file_path}")
-
-def get_selection_choices(api_url, headers, selection_list_pk):
-    """
-    Function to get choices from a specific selection list in InvenTree.
-    """
-    url = f'{api_url}selection/{selection_list_pk}/'
-    response = requests.get(url, headers=headers)
-    
-    if response.status_code == 200:
-        return response.json().get('choices', [])
-    else:
-        logging.error(f'Failed to retrieve selection choices: {response.status_code}')
-        return []
-
-def check_naming_convention(part_name, api_url, headers):
-    """
-    Checks if the part name follows the specified naming convention for LEDs.
-    Rules:
-    1. Part name should start with 'L_'.
-    2. The second segment should be a valid color from the selection list.
-    3. The third segment should be a valid max current value (e.g., 20mA).
-    4. The fourth segment should be a valid forward voltage value (e.g., 3.2V).
-    5. The fifth segment should be a valid type (e.g., LED3mm, LED5mm).
-    6. The sixth segment should be a valid mounting type (e.g., th, sm).
-    """
-    # Split the part name by underscore
-    parts = part_name.split('_')
-    
-    # Log all split parts of the name
-    logging.info(f"Split parts of '{part_name}': {parts}")
-    
-    # Check if the part name contains the expected number of segments
-    if len(parts) != 6:
-        logging.error(f"Invalid part name format: {part_name}. Expected 6 segments.")
-        return False
-    
-    # Check 1: Part name should start with 'L_'
-    check1 = parts[0] == 'L'
-    
-    # Check 2: The second segment should be a valid color
-    selection_list_pk_color = 18  # Assuming pk=18 for LED colors
-    choices_color = get_selection_choices(api_url, headers, selection_list_pk_color)
-    check2 = len(parts) > 1 and parts[1] in [choice['value'] for choice in choices_color]
-    
-    # Check 3: The third segment should be a valid max current value
-    current_pattern = re.compile(r'^\d+mA$')
-    third_segment = parts[2]
-    check3 = bool(current_pattern.match(third_segment))
-    logging.info(f"Check 3 result: {check3}")
-
-    # Check 4: The fourth segment should be a valid forward voltage value
-    voltage_pattern = re.compile(r'^\d+(\.\d+)?V$')
-    fourth_segment = parts[3]
-    check4 = bool(voltage_pattern.match(fourth_segment))
-    logging.info(f"Check 4 result: {check4}")
-
-    # Check 5: The fifth segment should be a valid type
-    selection_list_pk_type = 15  # Assuming pk=16 for LED types
-    choices_type = get_selection_choices(api_url, headers, selection_list_pk_type)
-    check5 = len(parts) > 4 and parts[4] in [choice['value'] for choice in choices_type]
-    
-    # Check 6: The sixth segment should be a valid mounting type
-    selection_list_pk_mounting = 17  # Assuming pk=17 for mounting types
-    choices_mounting = get_selection_choices(api_url, headers, selection_list_pk_mounting)
-    check6 = len(parts) > 5 and parts[5] in [choice['value'] for choice in choices_mounting]
-    
-    # Log the results of each check
-    logging.info(f"Check results for '{part_name}': {[check1, check2, check3, check4, check5, check6]}")
-    
-    # If all checks are true, the part name is compliant
-    if check1 and check2 and check3 and check4 and check5 and check6:
-        return True
-    else:
-        return False
-
-def main(api, category_pk, csv_file_path):
-    """
-    Main function to export parts to a CSV file.
-    """
-    # Check if the file is accessible
-    if not check_file_accessibility(csv_file_path):
-        return
-    
-    # Empty the previous CSV file if it exists
-    if os.path.exists(csv_file_path):
-        open(csv_file_path, 'w').close()
-    
-    mode = input("Select execution mode (1: all parts export, 2: parts not in line with the naming convention): ")
-    
-    parts = get_parts_in_category(api, category_pk)
-    
-    if mode == '1':
-        export_parts_to_csv(parts, csv_file_path)
-    elif mode == '2':
-        parts_to_export = [part for part in parts if not check_naming_convention(part.name, api_url, headers)]
-        export_parts_to_csv(parts_to_export, csv_file_path)
-    else:
-        logging.error("Invalid mode selected. Please select either 1 or 2.")
+# Naming rule in _py_common/naming_rules.json, which also sets the category to check
+RULE_NAME = 'led'
 
 if __name__ == "__main__":
-    category_pk = 80
     csv_file_path = 'led_update.csv'
-    main(api, category_pk, csv_file_path)
\ No newline at end of file
+    main(api, api_url, headers, RULE_NAME, csv_file_path)
@@ -1,28 +1,48 @@
-import requests
+import asyncio
 import os
+import requests
+import sys
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
 import csv
+from collections import namedtuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _py_common.inventree_async import AsyncInvenTreeClient, AsyncInvenTreeError
+from _py_common.inventree_session import create_session
+from _py_common.operation_plan import apply_plan_and_report, get_plan_path, write_plan
+from _py_common.run_journal import RunJournal
+from _py_common.selection_cache import SelectionListCache
+from _py_common.write_executor import run_concurrent
 
 # Define ANSI escape codes for colors
 RED = "\033[91m"
 RESET = "\033[0m"
 
-# Custom logging formatter to add color
+# Custom logging formatter to add color to the formatted output only
 class CustomFormatter(logging.Formatter):
     def format(self, record):
-        if record.levelno == logging.ERROR:
-            record.msg = f"{RED}{record.msg}{RESET}"
-        return super().format(record)
+        message = super().format(record)
+        if record.levelno >= logging.ERROR:
+            return f"{RED}{message}{RESET}"
+        return message
 
-# Set up logging
+load_dotenv()
+
+# Set up logging: records are queued by the caller and formatted and written
+# to the terminal by a background thread. LOG_LEVEL sets the verbosity.
 logger = logging.getLogger()
+log_queue = queue.Queue(-1)
 handler = logging.StreamHandler()
 handler.setFormatter(CustomFormatter())
-logger.addHandler(handler)
-logger.setLevel(logging.DEBUG)
-
-load_dotenv()
+log_listener = QueueListener(log_queue, handler)
+logger.addHandler(QueueHandler(log_queue))
+logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+log_listener.start()
+atexit.register(log_listener.stop)
 
 url = os.getenv('BASE_URL')
 token = os.getenv('INVENTREE_API_TOKEN')
@@ -36,263 +56,475 @@ headers = {
     'Content-Type': 'application/json'
 }
 
+# Pooled keep-alive session with timeouts and retries for all REST calls
+session = create_session()
+
+# Selection lists shared with the other scripts through the on-disk cache
+selection_cache = SelectionListCache(url, session, headers)
+
+# Page size used for the paginated bulk listings
+PAGE_SIZE = 500
+
+def iter_paginated_results(endpoint, params=None):
+    """
+    Walks a paginated list endpoint with limit/offset and yields the results
+    page by page as they arrive. Raises requests.HTTPError if a page fails.
+    """
+    params = dict(params or {})
+    params['limit'] = PAGE_SIZE
+    params['offset'] = 0
+    while True:
+        response = session.get(endpoint, headers=headers, params=params)
+        if response.status_code != 200:
+            logger.error(f"Failed to retrieve {endpoint} (offset {params['offset']}): {response.status_code} - {response.text}")
+            raise requests.HTTPError(f"{response.status_code} - {response.text}", response=response)
+        page = response.json()
+        # The server returns a plain list when it does not paginate the endpoint
+        if isinstance(page, list):
+            yield page
+            return
+        yield page['results']
+        params['offset'] += len(page['results'])
+        if not page.get('next') or not page['results']:
+            return
+
+def get_paginated_results(endpoint, params=None):
+    """
+    Returns all results of a paginated list endpoint, or None if any page fails.
+    """
+    try:
+        return [result for page in iter_paginated_results(endpoint, params) for result in page]
+    except requests.HTTPError:
+        return None
+
 # Option 1
+def filter_template_parameters(parameters):
+    filtered_params = []
+    for param in parameters:
+        filtered_param = {
+            'parameter_template': param.get('parameter_template'),
+            'parameter_template_detail': param.get('parameter_template_detail'),
+            'default_value': param.get('default_value')
+        }
+        filtered_params.append(filtered_param)
+    return filtered_params
+
 def get_parameters_templates_by_category(category_pk):
     endpoint = f"{url}part/category/parameters/?category={category_pk}"
-    response = requests.get(endpoint, headers=headers)
+    response = session.get(endpoint, headers=headers)
     if response.status_code == 200:
-        parameters = response.json()
-        filtered_params = []
-        for param in parameters:
-            filtered_param = {
-                'parameter_template': param.get('parameter_template'),
-                'parameter_template_detail': param.get('parameter_template_detail'),
-                'default_value': param.get('default_value')
-            }
-            filtered_params.append(filtered_param)
-        return filtered_params
+        return filter_template_parameters(response.json())
     else:
         logger.error(f"Failed to retrieve parameters: {response.status_code} - {response.text}")
         return None
 
-def get_parts_by_category(category_pk):
-    endpoint = f"{url}part/?category={category_pk}"
-    response = requests.get(endpoint, headers=headers)
-    if response.status_code == 200:
-        parts = response.json()
-        parts_list = [{'part name': part['name'], 'part pk': part['pk']} for part in parts]
-        return parts_list
-    else:
-        logger.error(f"Failed to retrieve parts: {response.status_code} - {response.text}")
+def get_category_parameter_index(category_pk):
+    """
+    Fetches the parameters of all parts in the category with a few paginated bulk
+    requests and indexes them by (part pk, template pk).
+    """
+    parts = get_paginated_results(f"{url}part/", {'category': category_pk, 'parameters': 'true'})
+    if parts is None:
         return None
-
-def get_current_parameters(part_pk):
-    endpoint = f"{url}part/category/parameters/{part_pk}/"
-    response = requests.get(endpoint, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        logger.error(f"Failed to retrieve current parameters for part {part_pk}: {response.status_code} - {response.text}")
+    parameter_index = index_part_parameters(parts)
+    if parameter_index is None:
         return None
+    logger.info(f"Indexed {len(parameter_index)} parameters for {len(parts)} parts in category {category_pk}")
+    return parameter_index
+
+# Without the embedded parameters every (part, template) pair would look
+# missing, so the snapshot is rejected instead of read as empty
+MISSING_PARAMETERS_ERROR = "The parts listing contains no 'parameters' key: the server does not embed the part parameters (parameters=true)."
+
+def index_part_parameters(parts):
+    """
+    Indexes the parameters embedded in a parts listing by (part pk, template pk).
+    Returns None if the listing does not embed the parameters.
+    """
+    parameter_index = {}
+    for part in parts:
+        if 'parameters' not in part:
+            logger.error(MISSING_PARAMETERS_ERROR)
+            return None
+        for param in part['parameters'] or []:
+            parameter_index[(part['pk'], param['template'])] = param
+    return parameter_index
+
+async def export_category_csv(category_pk):
+    """
+    Streams the parts of the category with their parameters into the CSV file.
+    Pages are prefetched concurrently and written as soon as they arrive.
+    Returns (rows written, API request count).
+    """
+    async with AsyncInvenTreeClient(url, token) as client:
+        parameters = filter_template_parameters(await client.list_category_templates(category_pk))
+        if not parameters:
+            return 0, client.request_count
+        row_count = await create_csv(parameters, client.iter_parts(category_pk, with_parameters=True), category_pk)
+    return row_count, client.request_count
 
-def create_csv(parameters, parts, category_pk):
+async def create_csv(parameters, part_pages, category_pk):
     parameter_template_names = [
         f"{param['parameter_template_detail']['name']}%{param['parameter_template']}%{param['parameter_template_detail'].get('selectionlist', 'False') or 'False'}%{param['parameter_template_detail'].get('checkbox', False)}"
         for param in parameters
     ]
     header_row = ['part name', 'part pk'] + parameter_template_names
     csv_filename = f"{category_pk}.csv"
-    with open(csv_filename, mode='w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(header_row)
-        logger.info(f"CSV header row: {header_row}")
-        for part in parts:
-            row = [part['part name'], part['part pk']]
-            current_parameters = get_current_parameters(part['part pk'])
-            if current_parameters:
-                for param in parameters:
-                    param_value = next((p['data'] for p in current_parameters if p['template'] == param['parameter_template']), '')
-                    row.append(param_value)
-            writer.writerow(row)
-            logger.info(f"CSV row for part {part['part pk']}: {row}")
+    # Rows are streamed into a temporary file that only replaces the existing
+    # sheet once every page arrived, so a failed fetch leaves the sheet intact
+    temp_filename = f"{csv_filename}.tmp"
+    row_count = 0
+    try:
+        with open(temp_filename, mode='w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(header_row)
+            logger.debug("CSV header row: %s", header_row)
+            async for parts in part_pages:
+                for part in parts:
+                    if 'parameters' not in part:
+                        raise ValueError(MISSING_PARAMETERS_ERROR)
+                    current_values = {param['template']: param['data'] for param in part['parameters'] or []}
+                    row = [part['name'], part['pk']]
+                    for param in parameters:
+                        row.append(current_values.get(param['parameter_template'], ''))
+                    writer.writerow(row)
+                    row_count += 1
+                    logger.debug("CSV row for part %s: %s", part['pk'], row)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+    os.replace(temp_filename, csv_filename)
     print(f"CSV file '{csv_filename}' with header row and parts data has been created successfully.")
+    return row_count
 
 #Option2
-def get_selection_lists():
-    logging.info("f_get_selection_lists function executed")
-    endpoint = f"{url}selection/"
-    response = requests.get(endpoint, headers=headers)
-    if response.status_code == 200:
-        selection_lists = response.json()
-        selection_list_map = {}
-        for selection_list in selection_lists:
-            pk = selection_list['pk']
-            values = [choice['value'] for choice in selection_list['choices']]
-            selection_list_map[pk] = values
-        return selection_list_map
-    else:
-        logging.error(f"Failed to retrieve selection lists: {response.status_code} - {response.text}")
-        return None
+# One parameter column of the CSV, parsed from its encoded
+# 'name%template pk%selection list pk%checkbox' header
+ParameterColumn = namedtuple('ParameterColumn', ['header', 'name', 'template_pk', 'selectionlist_pk', 'checkbox'])
 
-def validate_selection_list(selectionlist_pk, value, selection_list_map):
-    logging.info("f_validate_selection_list function executed")
-    try:
-        selectionlist_pk = int(selectionlist_pk)
-    except ValueError:
-        logging.error(f"Invalid selection list pk: {selectionlist_pk}")
-        return False
-    if selectionlist_pk in selection_list_map:
-        if value in selection_list_map[selectionlist_pk]:
-            return True
-        else:
-            logging.error(f"Value '{value}' not found in selection list pk: {selectionlist_pk}")
-            return False
-    else:
-        logging.error(f"Selection list pk '{selectionlist_pk}' not found in the selection list map.")
-        return False
+BOOLEAN_VALUES = frozenset(['true', 'false'])
 
-def validate_boolean_value(value):
-    logging.info("f_validate_boolean_value function executed")
-    if value.lower() in ['true', 'false']:
-        return True
-    else:
-        logging.error(f"Invalid boolean value: {value}")
-        return False
+def parse_csv_header(fieldnames):
+    """
+    Parses the encoded parameter headers of the CSV once into a column schema.
+    Raises ValueError if a header cannot be parsed.
+    """
+    columns = []
+    for header in fieldnames:
+        if header in ['part name', 'part pk']:
+            continue
+        parameter_template_info = header.split('%')
+        if len(parameter_template_info) != 4:
+            raise ValueError(f"Invalid parameter column header: {header}")
+        name, template_pk, selectionlist_pk, checkbox = parameter_template_info
+        try:
+            columns.append(ParameterColumn(
+                header=header,
+                name=name,
+                template_pk=int(template_pk),
+                selectionlist_pk=None if selectionlist_pk == 'False' else int(selectionlist_pk),
+                checkbox=checkbox == 'True'
+            ))
+        except ValueError:
+            raise ValueError(f"Invalid template or selection list pk in column header: {header}")
+    return columns
+
+def get_selection_lists():
+    """
+    Returns a map of selection list pk to the set of its values, served from
+    the selection list cache.
+    """
+    logging.debug("f_get_selection_lists function executed")
+    selection_list_map = selection_cache.get_all()
+    if selection_list_map is None:
+        logging.error("Failed to retrieve selection lists.")
+    return selection_list_map
 
 def validate_csv_data(category_pk):
-    logging.info("f_validate_csv_data executed")
+    """
+    Validates the CSV column by column against the parsed header schema.
+    Returns (all valid, error messages) with the errors in CSV row order.
+    """
+    logging.debug("f_validate_csv_data executed")
     selection_list_map = get_selection_lists()
     if not selection_list_map:
         logging.error("Failed to retrieve selection lists. Aborting validation.")
         return False, ["Failed to retrieve selection lists."]
-    
-    validation_registry = {}
-    error_messages = []
 
     csv_filename = f"{category_pk}.csv"
-    
+
     with open(csv_filename, mode='r') as file:
         reader = csv.DictReader(file)
-        for row in reader:
-            part_pk = row['part pk']
-            validation_registry[part_pk] = True
-            for key, value in row.items():
-                if key not in ['part name', 'part pk']:
-                    parameter_template_info = key.split('%')
-                    parameter_template_name = parameter_template_info[0]
-                    parameter_template_pk = parameter_template_info[1]
-                    selectionlist_pk = parameter_template_info[2]
-                    parameter_boolean = parameter_template_info[3]
-                    
-                    if selectionlist_pk == 'False':
-                        logging.info("no selection list")
-                    else:
-                        check_selection = validate_selection_list(selectionlist_pk, value, selection_list_map)
-                        logging.info(f"check selection results= {check_selection}")
-                        if not check_selection:
-                            validation_registry[part_pk] = False
-                            error_messages.append(f"Part pk: {part_pk}, Parameter template: {parameter_template_name}, Value: {value} - Invalid selection list value.")
-                    
-                    if parameter_boolean == 'True':
-                        boolean_check = validate_boolean_value(value)
-                        logging.info(f"boolean check results= {boolean_check}")
-                        if not boolean_check:
-                            validation_registry[part_pk] = False
-                            error_messages.append(f"Part pk: {part_pk}, Parameter template: {parameter_template_name}, Value: {value} - Invalid boolean value.")
-    
-    all_valid = all(validation_registry.values())
+        try:
+            columns = parse_csv_header(reader.fieldnames)
+        except ValueError as e:
+            logging.error(str(e))
+            return False, [str(e)]
+        rows = list(reader)
+
+    part_pks = [row['part pk'] for row in rows]
+    errors = []
+    for column_index, column in enumerate(columns):
+        values = [row[column.header] for row in rows]
+
+        if column.selectionlist_pk is not None:
+            allowed_values = selection_list_map.get(column.selectionlist_pk)
+            if allowed_values is None:
+                message = f"Parameter template: {column.name} - Selection list pk '{column.selectionlist_pk}' not found."
+                errors.append((-1, column_index, message))
+            else:
+                for row_index, value in enumerate(values):
+                    if value not in allowed_values:
+                        errors.append((row_index, column_index, f"Part pk: {part_pks[row_index]}, Parameter template: {column.name}, Value: {value} - Invalid selection list value."))
+
+        if column.checkbox:
+            for row_index, value in enumerate(values):
+                if value.lower() not in BOOLEAN_VALUES:
+                    errors.append((row_index, column_index, f"Part pk: {part_pks[row_index]}, Parameter template: {column.name}, Value: {value} - Invalid boolean value."))
+
+    errors.sort(key=lambda error: error[:2])
+    error_messages = [message for _, _, message in errors]
+
+    all_valid = not error_messages
     if all_valid:
-        logging.info("All data in the CSV file is valid.")
+        logging.info(f"All data in the CSV file is valid ({len(rows)} rows, {len(columns)} parameter columns).")
     else:
-        logging.error("Some data in the CSV file is invalid. Aborting update.")
-    
+        logging.error(f"Some data in the CSV file is invalid ({len(error_messages)} errors). Aborting update.")
+
     return all_valid, error_messages
 #Option3
 
+def parameter_value_unchanged(current_value, new_value, is_checkbox):
+    """
+    Returns True if the CSV value matches the value stored on the server.
+    Checkbox values are compared case-insensitively (True/true).
+    """
+    current_value = '' if current_value is None else str(current_value).strip()
+    new_value = new_value.strip()
+    if is_checkbox:
+        return current_value.lower() == new_value.lower()
+    return current_value == new_value
+
+def send_parameter_update(update, journal):
+    """
+    Sends a single parameter PUT and journals it once it succeeded.
+    Returns the response.
+    """
+    response = session.put(update['endpoint'], headers=headers, json=update['payload'])
+    if response.status_code == 200:
+        journal.record(update['part_pk'], update['payload']['template'])
+    return response
+
+def iter_parameter_cells(csv_filename):
+    """
+    Yields (part pk, column, value) for every parameter cell of the CSV.
+    """
+    with open(csv_filename, mode='r') as file:
+        reader = csv.DictReader(file)
+        columns = parse_csv_header(reader.fieldnames)
+        for row in reader:
+            for column in columns:
+                yield row['part pk'], column, row[column.header]
+
 def part_category_parameters_update(category_pk):
-    logging.info("f_part_category_parameters_update executed")
+    logging.debug("f_part_category_parameters_update executed")
     selection_list_map = get_selection_lists()
     if not selection_list_map:
         logging.error("Failed to retrieve selection lists. Aborting parameter update.")
         return
     
+    # Map every (part, template) pair of the category to its parameter pk once
+    parameter_index = get_category_parameter_index(category_pk)
+    if parameter_index is None:
+        logging.error("Failed to retrieve the category parameters. Aborting parameter update.")
+        return
+
     csv_filename = f"{category_pk}.csv"
+    missing_parameters = []
+    pending_updates = []
+    unchanged_count = 0
+    resumed_count = 0
 
-    with open(csv_filename, mode='r') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            part_pk = row['part pk']
-            for key, value in row.items():
-                if key not in ['part name', 'part pk']:
-                    parameter_template_info = key.split('%')
-                    parameter_template_name = parameter_template_info[0]
-                    parameter_template_pk = parameter_template_info[1]
-                    selectionlist_pk = parameter_template_info[2]
-                    
-                    # Check if the parameter already exists for the part
-                    endpoint = f"{url}part/parameter/?part={part_pk}&template={parameter_template_pk}"
-                    response = requests.get(endpoint, headers=headers)
-                    if response.status_code == 200:
-                        existing_parameters = response.json()
-                        if existing_parameters:
-                            # Update the existing parameter
-                            parameter_pk = existing_parameters[0]['pk']
-                            endpoint = f"{url}part/parameter/{parameter_pk}/"
-                            payload = {
-                                'part': part_pk,
-                                'template': parameter_template_pk,
-                                'data': value,
-                                'selectionlist': selectionlist_pk if selectionlist_pk != 'False' else None
-                            }
-                            response = requests.put(endpoint, headers=headers, json=payload)
-                            if response.status_code == 200:
-                                logging.info(f"Successfully updated part pk: {part_pk}, Parameter template: {parameter_template_name}, Value: {value}")
-                            else:
-                                logging.error(f"Failed to update part pk: {part_pk}, Parameter template: {parameter_template_name}, Value: {value} - {response.status_code} - {response.text}")
-                        else:
-                            logging.error(f"No existing parameter found for part pk: {part_pk}, Parameter template: {parameter_template_name}. Skipping update.")
-                    else:
-                        logging.error(f"Failed to retrieve existing parameters for part pk: {part_pk}, Parameter template: {parameter_template_name} - {response.status_code} - {response.text}")
+    # Cells completed by an interrupted earlier run of this same file are skipped
+    journal = RunJournal(csv_filename)
+    if journal.completed:
+        print(f"Resuming from {journal.path}: {len(journal.completed)} cells were already updated.")
+
+    for part_pk, column, value in iter_parameter_cells(csv_filename):
+        if journal.is_done(part_pk, column.template_pk):
+            resumed_count += 1
+            continue
+
+        existing_parameter = parameter_index.get((int(part_pk), column.template_pk))
+        if not existing_parameter:
+            missing_parameters.append((part_pk, column.name))
+            continue
+
+        # Only send cells whose value differs from the server
+        if parameter_value_unchanged(existing_parameter.get('data'), value, column.checkbox):
+            unchanged_count += 1
+            continue
+
+        # Queue the update of the existing parameter
+        pending_updates.append({
+            'part_pk': part_pk,
+            'name': column.name,
+            'value': value,
+            'endpoint': f"{url}part/parameter/{existing_parameter['pk']}/",
+            'payload': {
+                'part': part_pk,
+                'template': column.template_pk,
+                'data': value,
+                'selectionlist': column.selectionlist_pk
+            }
+        })
+
+    # Send the writes concurrently; responses come back in CSV row order
+    try:
+        responses = run_concurrent(lambda update: send_parameter_update(update, journal), pending_updates)
+    except BaseException:
+        journal.close()
+        raise
+    changed_count = 0
+    failed_count = 0
+    row_summaries = {}
+    for update, response in zip(pending_updates, responses):
+        row_summary = row_summaries.setdefault(update['part_pk'], {'updated': 0, 'failed': 0})
+        if isinstance(response, Exception):
+            failed_count += 1
+            row_summary['failed'] += 1
+            logging.error(f"Failed to update part pk: {update['part_pk']}, Parameter template: {update['name']}, Value: {update['value']} - {response}")
+        elif response.status_code == 200:
+            changed_count += 1
+            row_summary['updated'] += 1
+            logging.debug("Successfully updated part pk: %s, Parameter template: %s, Value: %s", update['part_pk'], update['name'], update['value'])
+        else:
+            failed_count += 1
+            row_summary['failed'] += 1
+            logging.error(f"Failed to update part pk: {update['part_pk']}, Parameter template: {update['name']}, Value: {update['value']} - {response.status_code} - {response.text}")
+    for part_pk, row_summary in row_summaries.items():
+        logging.info(f"Part pk: {part_pk} - {row_summary['updated']} parameters updated, {row_summary['failed']} failed")
+
+    # Keep the journal when cells failed, so a rerun only retries those
+    journal.close(finished=failed_count == 0)
+
+    print(f"Parameter update summary: {changed_count} changed, {unchanged_count} unchanged, {len(missing_parameters)} skipped, {failed_count} failed, {resumed_count} already done.")
+    if missing_parameters:
+        logging.error(f"No existing parameter found for {len(missing_parameters)} cells. These were skipped:")
+        for part_pk, parameter_template_name in missing_parameters:
+            logging.error(f"  Part pk: {part_pk}, Parameter template: {parameter_template_name}")
+
+def plan_category_parameters_update(category_pk):
+    """
+    Compares the CSV with a bulk snapshot of the category and writes the
+    resulting update/skip operations to the plan file without sending anything.
+    """
+    parameter_index = get_category_parameter_index(category_pk)
+    if parameter_index is None:
+        logging.error("Failed to retrieve the category parameters. Aborting plan.")
+        return
+
+    operations = []
+    for part_pk, column, value in iter_parameter_cells(f"{category_pk}.csv"):
+        label = f"part {part_pk} / {column.name}"
+        existing_parameter = parameter_index.get((int(part_pk), column.template_pk))
+        if not existing_parameter:
+            operations.append({'op': 'skip', 'label': label, 'reason': 'no existing parameter'})
+        elif parameter_value_unchanged(existing_parameter.get('data'), value, column.checkbox):
+            operations.append({'op': 'skip', 'label': label, 'reason': 'unchanged'})
+        else:
+            operations.append({
+                'op': 'update',
+                'resource': 'part/parameter',
+                'pk': existing_parameter['pk'],
+                'label': label,
+                'payload': {
+                    'part': int(part_pk),
+                    'template': column.template_pk,
+                    'data': value,
+                    'selectionlist': column.selectionlist_pk
+                }
+            })
+
+    plan_path = get_plan_path(f"{category_pk}.csv")
+    counts = write_plan(plan_path, operations)
+    print(f"Plan '{plan_path}' written: {counts['update']} updates, {counts['skip']} skipped.")
 
 #Option4
 def normalize_parameters(category_pk):
+    """
+    Adds the missing category template parameters to the parts of the category.
+    The missing (part, template, default) set is computed from one bulk snapshot
+    of the category and created with concurrent writes.
+    Returns True if the normalization ran to completion.
+    """
     # Retrieve the template parameters for the category
     category_parameters = get_parameters_templates_by_category(category_pk)
     if not category_parameters:
         print("Failed to retrieve category parameters.")
-        return
+        return False
 
-    # Retrieve the parts in the category
-    parts = get_parts_by_category(category_pk)
-    if not parts:
+    # Retrieve all parts of the category with their parameters in bulk
+    parts = get_paginated_results(f"{url}part/", {'category': category_pk, 'parameters': 'true'})
+    if parts is None:
         print("Failed to retrieve parts.")
-        return
-
-    # Iterate through each part
-    for part in parts:
-        part_pk = part['part pk']
-        current_parameters = get_current_parameters(part_pk)
-        if current_parameters is None:
-            continue
+        return False
+    parameter_index = index_part_parameters(parts)
+    if parameter_index is None:
+        print("Failed to retrieve the part parameters. Normalization aborted.")
+        return False
 
-        # Create a set of current parameter templates for the part
-        current_templates = {param['template'] for param in current_parameters}
+    # Use the default value for every template parameter a part is missing
+    missing_parameters = [
+        (part['pk'], category_param['parameter_template'], category_param['default_value'])
+        for part in parts
+        for category_param in category_parameters
+        if (part['pk'], category_param['parameter_template']) not in parameter_index
+    ]
 
-        # Check for missing template parameters
-        for category_param in category_parameters:
-            template_id = category_param['parameter_template']
-            if template_id not in current_templates:
-                # Log the missing template parameter
-                logger.info(f"Missing parameter {category_param['parameter_template_detail']['name']} for part {part_pk}")
-                # Use the default value to add the missing template parameter to the part
-                default_value = category_param['default_value']
-                add_parameter_to_part(part_pk, template_id, default_value)
+    print(f"{len(missing_parameters)} missing parameters found for {len(parts)} parts.")
+    if not missing_parameters:
+        return True
+    confirmation = input("Do you want to add the missing parameters with their default values? (yes/no): ")
+    if confirmation.lower() != 'yes':
+        logger.info("Normalization aborted by user.")
+        return False
 
-    print("Parameters have been normalized successfully.")
+    # Create the missing parameters concurrently and log the results in order
+    responses = run_concurrent(lambda missing: add_parameter_to_part(*missing), missing_parameters)
+    added_by_part = {}
+    failed_count = 0
+    for (part_pk, template_id, _), response in zip(missing_parameters, responses):
+        if isinstance(response, Exception):
+            failed_count += 1
+            logger.error(f"Failed to add parameter {template_id} to part {part_pk}: {response}")
+        elif response.status_code == 201:
+            added_by_part[part_pk] = added_by_part.get(part_pk, 0) + 1
+            logger.debug("Successfully added parameter %s to part %s", template_id, part_pk)
+        else:
+            failed_count += 1
+            logger.error(f"Failed to add parameter {template_id} to part {part_pk}: {response.status_code} - {response.text}")
+    for part_pk, added_count in added_by_part.items():
+        logger.info(f"Part pk: {part_pk} - {added_count} missing parameters added")
 
-def get_current_parameters(part_pk):
-    endpoint = f"{url}part/parameter/?part={part_pk}"
-    response = requests.get(endpoint, headers=headers)
-    if response.status_code == 200:
-        parameters = response.json()
-        logger.info(f"Retrieved parameters for part {part_pk}: {parameters}")
-        return parameters
+    if failed_count:
+        print(f"Parameters have been normalized with {failed_count} errors.")
     else:
-        logger.error(f"Failed to retrieve current parameters for part {part_pk}: {response.status_code} - {response.text}")
-        return None
+        print("Parameters have been normalized successfully.")
+    return True
 
 def add_parameter_to_part(part_pk, template_id, default_value):
+    """
+    Creates a parameter for the part. Returns the response.
+    """
     endpoint = f"{url}part/parameter/"
     data = {
         'part': part_pk,
         'template': template_id,
         'data': default_value
     }
-    response = requests.post(endpoint, headers=headers, json=data)
-    if response.status_code == 201:
-        logger.info(f"Successfully added parameter {template_id} to part {part_pk}")
-    else:
-        logger.error(f"Failed to add parameter {template_id} to part {part_pk}: {response.status_code} - {response.text}")
+    return session.post(endpoint, headers=headers, json=data)
 
 #main
 def main():
@@ -306,16 +538,20 @@ def main():
         print("2. Validate the information in the CSV file")
         print("3. Normalize the parameters of the parts according to the category parameters")
         print("4. Process the data and update the parts")
-        print("5. Exit")
+        print("5. Plan the update into an operation file for review")
+        print("6. Apply the operation file")
+        print("7. Exit")
         
-        choice = input("Enter your choice (1, 2, 3, 4, or 5): ")
+        choice = input("Enter your choice (1, 2, 3, 4, 5, 6 or 7): ")
         
         if choice == '1':
-            parameters = get_parameters_templates_by_category(category_pk)
-            parts = get_parts_by_category(category_pk)
-            if parameters and parts:
-                create_csv(parameters, parts, category_pk)
-                print("CSV file with header row and parts data has been created successfully.")
+            try:
+                row_count, request_count = asyncio.run(export_category_csv(category_pk))
+            except (AsyncInvenTreeError, ValueError) as e:
+                logger.error(f"Failed to retrieve the category data: {e}")
+                row_count, request_count = 0, 0
+            if row_count:
+                print(f"CSV file with {row_count} parts has been created with {request_count} API requests.")
             else:
                 print("No parameters or parts found or failed to retrieve data.")
         
@@ -333,8 +569,7 @@ def main():
             if not validation_executed:
                 print("Please validate the CSV file first by selecting option 2.")
             else:
-                normalize_parameters(category_pk)
-                normalization_executed = True
+                normalization_executed = normalize_parameters(category_pk)
         
         elif choice == '4':
             if not validation_executed:
@@ -345,11 +580,20 @@ def main():
                 part_category_parameters_update(category_pk)
         
         elif choice == '5':
+            if not validation_executed:
+                print("Please validate the CSV file first by selecting option 2.")
+            else:
+                plan_category_parameters_update(category_pk)
+        
+        elif choice == '6':
+            apply_plan_and_report(get_plan_path(f"{category_pk}.csv"), create_session(token), url)
+        
+        elif choice == '7':
             print("Exiting the script. Goodbye!")
             break
         
         else:
-            print("Invalid choice. Please enter 1, 2, 3, 4 or 5.")
+            print("Invalid choice. Please enter 1, 2, 3, 4, 5, 6 or 7.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,10 +3,17 @@ from inventree.api import InvenTreeAPI
 from inventree.part import Part
 from inventree.company import SupplierPart
 import os
+import sys
 import logging
 import csv
 from dotenv import load_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _py_common.inventree_session import create_session
+from _py_common.part_fetch import fetch_parts_by_pk
+from _py_common.operation_plan import apply_plan_and_report, get_plan_path, write_plan
+from _py_common.run_journal import RunJournal
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -31,13 +38,29 @@ part_fields = [
     'supplier_pack_quantity'
 ]
 
+# Number of parts requested per page when listing a category
+PAGE_SIZE = 500
+
+def iter_parts_in_category(category_pk):
+    """
+    Walks the parts of the category with limit/offset and yields them page by
+    page as they arrive, instead of loading the whole category at once.
+    The listing ends on the 'next' link and 'count' of the response, so a
+    server that caps the page size below PAGE_SIZE is still read completely.
+    """
+    offset = 0
+    while True:
+        page = api.get(Part.URL, params={'category': category_pk, 'limit': PAGE_SIZE, 'offset': offset})
+        results = page['results']
+        for data in results:
+            yield Part(api, data=data)
+        offset += len(results)
+        if not results or not page.get('next') or offset >= page['count']:
+            return
+
 def get_parts_by_category(category_pk):
-    parts = Part.list(api, category=category_pk)
-    parts_list = []
-    for part in parts:
-        part_data = {field: getattr(part, field, '') for field in part_fields}
-        parts_list.append(part_data)
-    return parts_list
+    for part in iter_parts_in_category(category_pk):
+        yield {field: getattr(part, field, '') for field in part_fields}
 
 def create_csv(parts, category_pk):
     header_row = part_fields
@@ -52,10 +75,12 @@ def create_csv(parts, category_pk):
             #logging.info(f"CSV row for part {part['name']}: {row}")
     #print(f"CSV file '{csv_filename}' with header row and parts data has been created successfully.")
 
-def collect_and_match_parts_from_csv(file_path, api):
+def collect_and_match_parts_from_csv(file_path, api, category_pk=None):
     """
     Reads the CSV file and matches parts in InvenTree by pk number.
-    Returns a list of matched parts and their data.
+    The parts of the category are listed page by page and the pks not found
+    there (e.g. parts moved to another category) are fetched in pk chunks.
+    Returns the list of matched parts with their data and the unmatched rows.
     """
     logging.info("Reading CSV file")
     df = pd.read_csv(file_path)
@@ -64,20 +89,88 @@ def collect_and_match_parts_from_csv(file_path, api):
 
     if 'pk' not in df.columns:
         logging.error("CSV file does not contain 'pk' column.")
-        return []
+        return [], []
+
+    row_pks = pd.to_numeric(df['pk'], errors='coerce')
+    wanted_pks = {int(pk) for pk in row_pks.dropna()}
+    parts = {}
+    if category_pk:
+        parts = {part.pk: part for part in iter_parts_in_category(category_pk) if part.pk in wanted_pks}
+    missing_pks = wanted_pks - parts.keys()
+    if missing_pks:
+        parts.update(fetch_parts_by_pk(api, missing_pks))
 
     matched_parts = []
-    for _, row in df.iterrows():
-        part_pk = row['pk']
-        logging.info(f"Searching for part with pk: {part_pk}")
-        part = Part(api, pk=part_pk)
-        if part:
-            logging.info(f"Part found: {part.name} (ID: {part.pk})")
+    unmatched_rows = []
+    for (_, row), part_pk in zip(df.iterrows(), row_pks):
+        part = parts.get(int(part_pk)) if pd.notna(part_pk) else None
+        if part is not None:
             matched_parts.append((part, row))
         else:
-            logging.info(f"No matching part found for pk: {part_pk}")
+            logging.info(f"No matching part found for pk: {row['pk']}")
+            unmatched_rows.append(row)
+
+    logging.info(f"Matched {len(matched_parts)} parts, {len(unmatched_rows)} rows without a matching part")
+    return matched_parts, unmatched_rows
+
+# Fields of part_fields that are exported for reference but never written to the part
+READ_ONLY_FIELDS = {
+    'pk', 'parameters', 'attachments', 'existing_image',
+    'supplier_pk', 'supplier_part_number', 'supplier_link', 'supplier_pack_quantity'
+}
+WRITABLE_FIELDS = [field for field in part_fields if field not in READ_ONLY_FIELDS]
+TRUE_VALUES = {'true', '1', 'yes'}
+FALSE_VALUES = {'false', '0', 'no'}
+
+def to_plain_value(value):
+    """
+    Converts numpy scalars read through pandas to plain Python values.
+    """
+    return value.item() if hasattr(value, 'item') else value
+
+def parse_csv_value(value, current):
+    """
+    Converts a CSV cell to the type of the current part value.
+    Returns the converted value and whether it equals the current one.
+    """
+    value = to_plain_value(value)
+    if isinstance(current, bool):
+        text = str(value).strip().lower()
+        if text in TRUE_VALUES or text in FALSE_VALUES:
+            value = text in TRUE_VALUES
+        return value, value == current
+    if isinstance(current, (int, float)) or isinstance(value, (int, float)):
+        try:
+            return value, float(value) == float(current)
+        except (TypeError, ValueError):
+            pass
+    return value, str(value).strip() == str(current if current is not None else '').strip()
+
+def get_part_update_data(part, part_data):
+    """
+    Returns the writable part fields of a CSV row that differ from the part.
+    Blank cells are skipped.
+    """
+    update_data = {}
+    for field in WRITABLE_FIELDS:
+        if field not in part_data or str(part_data[field]).strip() == '':
+            continue
+        value, unchanged = parse_csv_value(part_data[field], getattr(part, field, None))
+        if not unchanged:
+            update_data[field] = value
+    return update_data
 
-    return matched_parts
+def get_supplier_data(part_pk, row):
+    """
+    Builds the supplier part payload of a CSV row.
+    """
+    return {
+        'part': part_pk,
+        'supplier': row['supplier_pk'],
+        'SKU': row['supplier_part_number'],
+        'link': row['supplier_link'],
+        'pack_quantity': int(row['supplier_pack_quantity']) if row['supplier_pack_quantity'] != '' else 0
+    }
 
 def update_part_information(part, part_data):
     """
@@ -85,9 +178,12 @@ def update_part_information(part, part_data):
     Returns the updated part if successful, otherwise returns None.
     """
     try:
-        update_data = {field: part_data[field] for field in part_fields if field in part_data}
+        update_data = get_part_update_data(part, part_data)
+        if not update_data:
+            logging.info(f"Part unchanged: {part.name} - {part.pk}")
+            return part
         part.save(update_data)
-        logging.info(f"Updated part: {part.name} - {part.pk}")
+        logging.info(f"Updated part: {part.name} - {part.pk} ({', '.join(update_data)})")
         return part
     except Exception as e:
         logging.error(f"Error updating part: {e}")
@@ -116,6 +212,54 @@ def update_supplier_information(api, part, supplier_data):
         logging.error(f"Error updating supplier part: {e}")
         return None
     
+def get_supplier_part_index(api, supplier_pks):
+    """
+    Lists the supplier parts of the given suppliers, one listing per supplier
+    instead of one per CSV row. Returns them indexed by (part pk, supplier pk).
+    """
+    index = {}
+    for supplier_pk in supplier_pks:
+        for supplier_part in SupplierPart.list(api, supplier=supplier_pk):
+            index.setdefault((supplier_part.part, supplier_part.supplier), supplier_part)
+    return index
+
+def plan_parts_update(csv_file_path, api, category_pk=None):
+    """
+    Reads the CSV and the matching parts and supplier parts from the server and
+    writes the resulting operations to the plan file without sending anything.
+    """
+    matched_parts, _ = collect_and_match_parts_from_csv(csv_file_path, api, category_pk)
+    supplier_pks = {int(row['supplier_pk']) for _, row in matched_parts if row['supplier_pk'] != '' and row['supplier_part_number']}
+    supplier_parts = get_supplier_part_index(api, supplier_pks)
+    operations = []
+    for part, row in matched_parts:
+        update_data = get_part_update_data(part, row)
+        if update_data:
+            operations.append({
+                'op': 'update',
+                'resource': 'part',
+                'pk': part.pk,
+                'label': f"part {part.pk} ({part.name})",
+                'payload': update_data
+            })
+        else:
+            operations.append({'op': 'skip', 'label': f"part {part.pk} ({part.name})", 'reason': 'unchanged'})
+
+        supplier_data = get_supplier_data(part.pk, row)
+        label = f"supplier part of part {part.pk} ({part.name})"
+        if not supplier_data['supplier'] or not supplier_data['SKU']:
+            operations.append({'op': 'skip', 'label': label, 'reason': 'supplier or SKU is blank'})
+            continue
+        supplier_part = supplier_parts.get((part.pk, int(supplier_data['supplier'])))
+        if supplier_part:
+            operations.append({'op': 'update', 'resource': 'company/part', 'pk': supplier_part.pk, 'label': label, 'payload': supplier_data})
+        else:
+            operations.append({'op': 'create', 'resource': 'company/part', 'label': label, 'payload': supplier_data})
+
+    plan_path = get_plan_path(csv_file_path)
+    counts = write_plan(plan_path, operations)
+    print(f"Plan '{plan_path}' written: {counts['create']} creates, {counts['update']} updates, {counts['skip']} skipped.")
+
 def display_intro():
     intro_text = """
     Welcome to the InvenTree Part Update Script!
@@ -131,6 +275,7 @@ def display_intro():
     1. Extract a CSV file containing part information from a specified category.
     2. Modify the extracted CSV file as needed.
     3. Start the update procedure to update parts and supplier information based on the modified CSV file.
+    4. Alternatively, plan the update into an operation file for review and apply it with parallel workers.
 
     Please follow the prompts to proceed with the desired action.
     """
@@ -151,9 +296,11 @@ def main(api, api_url, token):
         print("Select an option:")
         print("1. Extract parameter template file")
         print("2. Start the update procedure")
-        print("3. Exit")
+        print("3. Plan the update into an operation file for review")
+        print("4. Apply the operation file")
+        print("5. Exit")
         
-        choice = input("Enter your choice (1, 2, or 3): ")
+        choice = input("Enter your choice (1, 2, 3, 4, or 5): ")
         
         if choice == '1':
             parts_forcsv = get_parts_by_category(category_pk)
@@ -163,7 +310,7 @@ def main(api, api_url, token):
         
         elif choice == '2':
             csv_file_path = f"{category_pk}.csv"
-            matched_parts = collect_and_match_parts_from_csv(csv_file_path, api)
+            matched_parts, _ = collect_and_match_parts_from_csv(csv_file_path, api, category_pk)
             #for part, row in matched_parts:
             #    logging.info(f"Matched part: {part.name} with data: {row}")
 
@@ -173,24 +320,46 @@ def main(api, api_url, token):
                 logging.info("Update process aborted by user.")
                 return
 
-            for part, row in matched_parts:
-                updated_part = update_part_information(part, row)
-                if updated_part:
-                    supplier_data = {
-                        'part': updated_part.pk,
-                        'supplier': row['supplier_pk'],
-                        'SKU': row['supplier_part_number'],
-                        'link': row['supplier_link'],
-                        'pack_quantity': int(row['supplier_pack_quantity']) if row['supplier_pack_quantity'] != '' else 0
-                    }
-                    update_supplier_information(api, updated_part, supplier_data)
+            # Parts and supplier parts completed by an interrupted earlier run
+            # of this same file are skipped
+            errors_occurred = False
+            with RunJournal(csv_file_path) as journal:
+                if journal.completed:
+                    logging.info(f"Resuming from {journal.path}: {len(journal.completed)} operations were already completed.")
+
+                for part, row in matched_parts:
+                    if journal.is_done(part.pk, 'part'):
+                        updated_part = part
+                    else:
+                        updated_part = update_part_information(part, row)
+                        if not updated_part:
+                            errors_occurred = True
+                            continue
+                        journal.record(part.pk, 'part')
+
+                    if journal.is_done(part.pk, 'supplier'):
+                        continue
+                    supplier_data = get_supplier_data(updated_part.pk, row)
+                    if update_supplier_information(api, updated_part, supplier_data):
+                        journal.record(part.pk, 'supplier')
+                    elif supplier_data['supplier'] and supplier_data['SKU']:
+                        errors_occurred = True
+
+                # Keep the journal when a part failed, so a rerun only retries those
+                journal.close(finished=not errors_occurred)
         
         elif choice == '3':
+            plan_parts_update(f"{category_pk}.csv", api, category_pk)
+        
+        elif choice == '4':
+            apply_plan_and_report(get_plan_path(f"{category_pk}.csv"), create_session(token), api.api_url)
+        
+        elif choice == '5':
             print("Exiting the script. Goodbye!")
             break
         
         else:
-            print("Invalid choice. Please enter 1, 2, or 3.")
+            print("Invalid choice. Please enter 1, 2, 3, 4, or 5.")
 
 if __name__ == "__main__":
     main(api, url, token)
\ No newline at end of file
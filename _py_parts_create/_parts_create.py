@@ -3,11 +3,16 @@ from inventree.api import InvenTreeAPI
 from inventree.part import Part
 from inventree.company import SupplierPart
 import os
+import sys
 import logging
 import csv
 from dotenv import load_dotenv
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _py_common.inventree_session import create_session
+from _py_common.operation_plan import apply_plan_and_report, get_plan_path, write_plan
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -87,14 +92,49 @@ def create_parts_from_csv(csv_file):
     else:
         logging.info("Operation cancelled.")
 
+def plan_parts_creation(csv_file):
+    """
+    Writes one create operation per CSV row to the plan file, with the supplier
+    part as a child that receives the new part pk. Nothing is sent to the server.
+    """
+    df = pd.read_csv(csv_file)
+    df = df.fillna('').infer_objects(copy=False)
+
+    operations = []
+    for index, row in df.iterrows():
+        operation = {
+            'op': 'create',
+            'resource': 'part',
+            'label': f"row {index} ({row['name']})",
+            'payload': {field: row[field] for field in part_fields if field in row}
+        }
+        if row['supplier_pk'] and row['supplier_part_number'] and row['supplier_part_number'] != '0':
+            operation['children'] = [{
+                'resource': 'company/part',
+                'parent_field': 'part',
+                'payload': {
+                    'supplier': row['supplier_pk'],
+                    'SKU': row['supplier_part_number'],
+                    'link': row['supplier_link'],
+                    'pack_quantity': int(row['supplier_pack_quantity']) if row['supplier_pack_quantity'] != '' else 0
+                }
+            }]
+        operations.append(operation)
+
+    plan_path = get_plan_path(csv_file)
+    counts = write_plan(plan_path, operations)
+    print(f"Plan '{plan_path}' written: {counts['create']} parts to create.")
+
 def main():
     while True:
         print("Select an option:")
         print("1. Create CSV template")
         print("2. Create parts from CSV file")
-        print("3. Exit")
+        print("3. Plan parts creation from CSV file into an operation file for review")
+        print("4. Apply the operation file")
+        print("5. Exit")
         
-        choice = input("Enter your choice (1, 2, or 3): ")
+        choice = input("Enter your choice (1, 2, 3, 4, or 5): ")
         
         if choice == '1':
             create_csv_template()
@@ -104,11 +144,19 @@ def main():
             create_parts_from_csv(csv_file)
         
         elif choice == '3':
+            csv_file = input("Enter the CSV file name: ")
+            plan_parts_creation(csv_file)
+        
+        elif choice == '4':
+            csv_file = input("Enter the CSV file name: ")
+            apply_plan_and_report(get_plan_path(csv_file), create_session(token), api.api_url)
+        
+        elif choice == '5':
             print("Exiting the script. Goodbye!")
             break
         
         else:
-            print("Invalid choice. Please enter 1, 2, or 3.")
+            print("Invalid choice. Please enter 1, 2, 3, 4, or 5.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -8,6 +8,7 @@ It performs the following steps:
 
 2. Define Headers for Authentication:
    - The script sets up the headers required for authentication with the InvenTree API using the API token.
+   - Requests go through a shared session that reuses connections and retries transient failures with backoff.
 
 3. Define Function to Get Existing Selection Lists:
    - The `get_selection_lists` function sends a GET request to the InvenTree API to retrieve existing selection lists.
@@ -44,9 +45,13 @@ It performs the following steps:
 Overall, this script automates the process of managing selection lists in InvenTree, making it easier to add new choices to existing selection lists based on data from a CSV file.
 """
 import csv
-import requests
-from dotenv import load_dotenv
 import os
+import sys
+from dotenv import load_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _py_common.inventree_session import create_session
+from _py_common.selection_cache import SelectionListCache
 
 # Load environment variables from .env file
 load_dotenv()
@@ -61,10 +66,16 @@ headers = {
     'Content-Type': 'application/json'
 }
 
+# Pooled keep-alive session with timeouts and retries
+session = create_session()
+
+# Cached selection lists used by the other scripts
+selection_cache = SelectionListCache(api_url, session, headers)
+
 # Function to get existing selection lists from InvenTree
 def get_selection_lists():
     url = f'{api_url}selection/'
-    response = requests.get(url, headers=headers)
+    response = session.get(url, headers=headers)
     
     if response.status_code == 200:
         return response.json()
@@ -76,7 +87,7 @@ def get_selection_lists():
 # Function to add choices to an existing selection list
 def add_choices_to_selection_list(selection_list_id, choices):
     url = f'{api_url}selection/{selection_list_id}/'
-    response = requests.get(url, headers=headers)
+    response = session.get(url, headers=headers)
     
     if response.status_code == 200:
         existing_list = response.json()
@@ -90,10 +101,12 @@ def add_choices_to_selection_list(selection_list_id, choices):
             'choices': updated_choices
         }
         
-        response = requests.put(url, headers=headers, json=payload)
+        response = session.put(url, headers=headers, json=payload)
         
         if response.status_code == 200:
             print('Choices added successfully!')
+            # Let the other scripts pick up the change
+            selection_cache.invalidate()
             return response.json()
         else:
             print(f'Failed to add choices: {response.status_code}')